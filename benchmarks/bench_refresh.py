@@ -0,0 +1,320 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 刷新链路基准测试：通过本地回放服务重放一整晚的记分板序列，测量
+#   parse     JSON 解码 + _parse_game (标准库基线，以及各个可用的 FeedDecoder 后端)
+#   fetch     fetch_games 全流程 (HTTP 200 / 304)
+#   alloc     每次刷新的内存分配
+#   update_ui 面板增量更新耗时 (Qt offscreen 平台)
+#   e2e       从发起后台刷新到界面更新完成的端到端延迟
+#   startup   冷启动 (独立进程) 到首屏绘制 / 初始化完成的耗时
+# 结果以 JSON 输出，便于在 CI 中对比回归。
+#   python benchmarks/bench_refresh.py [--frames 240] [--output result.json]
+#   python benchmarks/bench_refresh.py --fixtures 录制目录
+#   python benchmarks/bench_refresh.py --record 录制目录 --count 120 --interval 30
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import load_recorded, record, synthetic_game_night
+from replay_server import ReplayServer
+
+
+def summarize(samples, unit_scale=1000.0):
+    # 秒 -> 毫秒统计
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.mean(ordered) * unit_scale, 4),
+        'p50_ms': round(ordered[len(ordered) // 2] * unit_scale, 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * unit_scale, 4),
+        'max_ms': round(ordered[-1] * unit_scale, 4)
+    }
+
+
+def bench_parse(frames):
+    from feed_decoder import FeedDecoder, available_backends
+    from nba_api import NBAApi
+
+    api = NBAApi(decoder=FeedDecoder('json'))
+    bodies = [json.dumps(frame, separators=(',', ':')).encode('utf-8') for frame in frames]
+    decode, parse = [], []
+    for body in bodies:
+        start = time.perf_counter()
+        data = json.loads(body)
+        middle = time.perf_counter()
+        api._parse_payload(data)
+        end = time.perf_counter()
+        decode.append(middle - start)
+        parse.append(end - middle)
+    api.close()
+
+    # 各解码后端：从响应字节到 [Game] 的总耗时 (与 fetch_games 的 decode + parse 阶段一致)
+    backends = {}
+    for backend in available_backends():
+        decoder = FeedDecoder(backend)
+        api = NBAApi(decoder=decoder)
+        samples = []
+        for body in bodies:
+            start = time.perf_counter()
+            games = decoder.decode_games(body)
+            if games is None:
+                api._parse_payload(decoder.loads(body))
+            samples.append(time.perf_counter() - start)
+        api.close()
+        backends[backend] = summarize(samples)
+    return {
+        'decode': summarize(decode),
+        'parse': summarize(parse),
+        'backends': backends,
+        'default_backend': FeedDecoder().backend,
+        'payload_bytes': round(statistics.mean(len(body) for body in bodies))
+    }
+
+
+def bench_fetch(frames):
+    from nba_api import NBAApi
+
+    server = ReplayServer(frames).start()
+    api = NBAApi(base_url=server.url)
+    full, not_modified, diff_sizes = [], [], []
+    try:
+        while True:
+            start = time.perf_counter()
+            success, result = api.fetch_games()
+            full.append(time.perf_counter() - start)
+            if not success:
+                raise RuntimeError(result)
+            diff_sizes.append(len(api.last_diff.changed_ids()))
+
+            # 同一帧再请求一次，命中 304
+            start = time.perf_counter()
+            api.fetch_games()
+            not_modified.append(time.perf_counter() - start)
+
+            if not server.advance():
+                break
+    finally:
+        api.close()
+        server.stop()
+    return {
+        'fetch_200': summarize(full),
+        'fetch_304': summarize(not_modified),
+        'changed_games_per_refresh': round(statistics.mean(diff_sizes), 2),
+        'response_counts': api.get_response_counts()
+    }
+
+
+def bench_alloc(frames):
+    from nba_api import NBAApi
+
+    server = ReplayServer(frames).start()
+    api = NBAApi(base_url=server.url)
+    allocated, peaks = [], []
+    try:
+        api.fetch_games() # 预热连接与模块
+        while server.advance():
+            tracemalloc.start()
+            api.fetch_games()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            allocated.append(current)
+            peaks.append(peak)
+    finally:
+        api.close()
+        server.stop()
+    return {
+        'retained_bytes_mean': round(statistics.mean(allocated)) if allocated else 0,
+        'peak_bytes_mean': round(statistics.mean(peaks)) if peaks else 0,
+        'peak_bytes_max': max(peaks) if peaks else 0
+    }
+
+
+def bench_ui(frames):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # 使用临时缓存目录，避免读写用户的真实缓存
+    os.environ['LOCALAPPDATA'] = tempfile.mkdtemp(prefix='nba_bench_')
+    os.environ.pop('NBA_SCORES_RELAY', None)
+    os.environ.pop('NBA_SCORES_LEAGUES', None) # 只回放 NBA 记分板
+    try:
+        from PyQt5.QtCore import QEventLoop, QTimer
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return {'skipped': 'PyQt5 不可用'}
+
+    import nba_api
+    server = ReplayServer(frames).start()
+    nba_api.NBAApi.BASE_URL = server.url
+
+    app = QApplication.instance() or QApplication([])
+    import nba_scores_panel
+
+    def wait_for_load(panel):
+        loop = QEventLoop()
+        panel.fetcher.finished.connect(loop.quit)
+        QTimer.singleShot(15000, loop.quit)
+        loop.exec_()
+        panel.fetcher.finished.disconnect(loop.quit)
+        panel.refresh_timer.stop()
+
+    panel = nba_scores_panel.NBAScoresPanel()
+    panel.show()
+    panel.finish_startup()
+    if panel.fetcher.is_busy():
+        wait_for_load(panel)
+    panel.refresh_timer.stop()
+
+    # update_ui：同步拉取后只测量界面更新
+    update_times = []
+    original_update_ui = panel.update_ui
+
+    def timed_update_ui(diff=None):
+        start = time.perf_counter()
+        original_update_ui(diff)
+        update_times.append(time.perf_counter() - start)
+
+    panel.update_ui = timed_update_ui
+
+    # e2e：推进一帧 -> 后台拉取 -> 信号回到 GUI 线程 -> 界面更新完成
+    e2e_times = []
+    while server.advance():
+        start = time.perf_counter()
+        panel.load_games()
+        wait_for_load(panel)
+        app.processEvents()
+        e2e_times.append(time.perf_counter() - start)
+
+    panel.update_ui = original_update_ui
+    panel.quit_app()
+    server.stop()
+    return {
+        'update_ui': summarize(update_times),
+        'e2e': summarize(e2e_times),
+        'rows': panel.game_model.rowCount()
+    }
+
+
+# 冷启动子进程：首屏绘制后等待初始化完成，输出各时间点后退出
+STARTUP_SCRIPT = '''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+import nba_api
+nba_api.NBAApi.BASE_URL = sys.argv[2]
+import nba_scores_panel
+app = QApplication(sys.argv[:1])
+panel = nba_scores_panel.NBAScoresPanel()
+panel.show()
+
+def check():
+    if not panel.startup_done:
+        QTimer.singleShot(1, check)
+        return
+    ready_ms = (time.perf_counter() - nba_scores_panel.STARTUP_CLOCK) * 1000
+    print(json.dumps({'ready_at': time.time(), 'first_paint_ms': panel.first_paint_ms, 'ready_ms': ready_ms}))
+    panel.quit_app()
+
+QTimer.singleShot(0, check)
+app.exec_()
+'''
+
+
+def bench_startup(frames, runs=5):
+    try:
+        import PyQt5  # noqa: F401
+    except ImportError:
+        return {'skipped': 'PyQt5 不可用'}
+
+    server = ReplayServer(frames).start()
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    env.pop('NBA_SCORES_RELAY', None)
+    env.pop('NBA_SCORES_LEAGUES', None)
+    env.pop('NBA_SCORES_METRICS', None)
+    process_ms, first_paint, ready = [], [], []
+    try:
+        for _ in range(runs):
+            env['LOCALAPPDATA'] = tempfile.mkdtemp(prefix='nba_bench_')
+            start = time.time()
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, os.path.join(ROOT, 'scripts'), server.url],
+                                    env=env, capture_output=True, text=True, timeout=60).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            # 含解释器启动在内的进程级耗时，以及模块导入起点开始计算的首屏 / 就绪耗时
+            process_ms.append(result['ready_at'] - start)
+            first_paint.append(result['first_paint_ms'] / 1000)
+            ready.append(result['ready_ms'] / 1000)
+    finally:
+        server.stop()
+    return {
+        'process_to_ready': summarize(process_ms),
+        'first_paint': summarize(first_paint),
+        'ready': summarize(ready)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='bench_refresh', description='NBA 实时比分刷新链路基准测试')
+    parser.add_argument('--frames', type=int, default=240, help='模拟比赛夜的帧数')
+    parser.add_argument('--games', type=int, default=12, help='模拟比赛夜的比赛场数')
+    parser.add_argument('--fixtures', default=None, help='回放录制的帧目录，代替模拟数据')
+    parser.add_argument('--skip-ui', action='store_true', help='跳过 Qt 界面相关测试')
+    parser.add_argument('--output', default=None, help='结果写入文件，默认输出到标准输出')
+    parser.add_argument('--record', default=None, help='从真实数据源录制帧到该目录后退出')
+    parser.add_argument('--count', type=int, default=120, help='录制帧数')
+    parser.add_argument('--interval', type=float, default=30, help='录制间隔 (秒)')
+    args = parser.parse_args(argv)
+
+    if args.record:
+        from nba_api import NBAApi
+        saved = record(args.record, NBAApi.BASE_URL, args.count, args.interval)
+        print(f"已录制 {saved} 帧到 {args.record}")
+        return 0
+
+    if args.fixtures:
+        frames = load_recorded(args.fixtures)
+        source = os.path.abspath(args.fixtures)
+    else:
+        frames = synthetic_game_night(args.games, args.frames)
+        source = f'synthetic:{args.games}x{args.frames}'
+
+    results = {
+        'meta': {
+            'source': source,
+            'frames': len(frames),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'parse': bench_parse(frames),
+        'fetch': bench_fetch(frames),
+        'alloc': bench_alloc(frames)
+    }
+    if not args.skip_ui:
+        # 面板自身的提示输出 (如“系统托盘不可用”) 转到 stderr，保证标准输出只有 JSON
+        with contextlib.redirect_stdout(sys.stderr):
+            results['ui'] = bench_ui(frames)
+            results['startup'] = bench_startup(frames)
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+# 基准测试用的记分板序列：可以回放录制的真实数据，也可以生成确定性的模拟比赛夜。
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW',
+         'HOU', 'IND', 'LAC', 'LAL', 'MEM', 'MIA', 'MIL', 'MIN', 'NOP', 'NYK',
+         'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+
+def _team(tricode, score, periods):
+    # 附带 periods / 球队统计等 _parse_game 不读取的字段，使负载接近真实数据
+    return {
+        'teamId': 1610612700 + TEAMS.index(tricode),
+        'teamName': tricode.title(),
+        'teamCity': tricode,
+        'teamTricode': tricode,
+        'wins': 10,
+        'losses': 5,
+        'score': score,
+        'seed': None,
+        'inBonus': None,
+        'timeoutsRemaining': 4,
+        'periods': [{'period': i + 1, 'periodType': 'REGULAR', 'score': s} for i, s in enumerate(periods)]
+    }
+
+
+def _leader(tricode):
+    return {'personId': 1, 'name': f'{tricode} Player', 'jerseyNum': '0', 'position': 'G',
+            'teamTricode': tricode, 'playerSlug': None, 'points': 20, 'rebounds': 5, 'assists': 5}
+
+
+def synthetic_game_night(num_games=12, frames=240, seed=7):
+    # 生成一个比赛夜的记分板帧序列：开赛时间错开，每帧推进比赛时钟与比分
+    rng = random.Random(seed)
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    start = datetime(2026, 1, 15, 0, 0, tzinfo=timezone.utc)
+
+    games = []
+    for i in range(num_games):
+        games.append({
+            'id': f'00225{i:05d}',
+            'away': teams[2 * i % len(teams)],
+            'home': teams[(2 * i + 1) % len(teams)],
+            'start_frame': (i * frames) // (num_games * 3),
+            'length': frames // 2 + rng.randint(0, frames // 6),
+            'tipoff': start + timedelta(minutes=30 * (i // 3)),
+            'away_periods': [0, 0, 0, 0],
+            'home_periods': [0, 0, 0, 0]
+        })
+
+    sequence = []
+    for frame in range(frames):
+        feed_games = []
+        for game in games:
+            progress = frame - game['start_frame']
+            if progress < 0:
+                status, text, period, clock = 1, '7:30 pm ET', 0, ''
+            elif progress >= game['length']:
+                status, text, period, clock = 3, 'Final', 4, ''
+            else:
+                status = 2
+                period = min(4, 1 + progress * 4 // game['length'])
+                remaining = 720 - (progress * 4 * 720 // game['length']) % 720
+                clock = f'PT{remaining // 60:02d}M{remaining % 60:02d}.00S'
+                text = f'Q{period} {remaining // 60}:{remaining % 60:02d}'
+                if rng.random() < 0.6:
+                    game['away_periods'][period - 1] += rng.choice((1, 2, 3))
+                if rng.random() < 0.6:
+                    game['home_periods'][period - 1] += rng.choice((1, 2, 3))
+
+            feed_games.append({
+                'gameId': game['id'],
+                'gameCode': f"20260115/{game['away']}{game['home']}",
+                'gameStatus': status,
+                'gameStatusText': text,
+                'period': period,
+                'gameClock': clock,
+                'gameTimeUTC': game['tipoff'].strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'gameEt': game['tipoff'].strftime('%Y-%m-%dT%H:%M:%S'),
+                'regulationPeriods': 4,
+                'ifNecessary': False,
+                'seriesGameNumber': '',
+                'seriesText': '',
+                'homeTeam': _team(game['home'], sum(game['home_periods']), game['home_periods']),
+                'awayTeam': _team(game['away'], sum(game['away_periods']), game['away_periods']),
+                'gameLeaders': {'homeLeaders': _leader(game['home']), 'awayLeaders': _leader(game['away'])},
+                'pbOdds': {'team': None, 'odds': 0.0, 'suspended': 0},
+                'broadcasters': {'nationalBroadcasters': [], 'homeTvBroadcasters': [], 'awayTvBroadcasters': []}
+            })
+
+        sequence.append({
+            'meta': {'version': 1, 'time': f'frame-{frame}'},
+            'scoreboard': {'gameDate': '2026-01-15', 'leagueId': '00', 'leagueName': 'National Basketball Association',
+                           'games': feed_games}
+        })
+    return sequence
+
+
+def load_recorded(directory):
+    # 读取 record() 录制的帧，按文件名顺序回放
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+    frames = []
+    for name in names:
+        with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+            frames.append(json.load(f))
+    return frames
+
+
+def record(directory, url, count, interval):
+    # 从真实数据源录制 count 帧，每 interval 秒一帧，内容未变化的帧不保存
+    import requests
+
+    os.makedirs(directory, exist_ok=True)
+    session = requests.Session()
+    last = None
+    saved = 0
+    for i in range(count):
+        body = session.get(url, timeout=10).content
+        if body != last:
+            with open(os.path.join(directory, f'frame_{i:05d}.json'), 'wb') as f:
+                f.write(body)
+            last = body
+            saved += 1
+        if i < count - 1:
+            time.sleep(interval)
+    return saved
@@ -0,0 +1,68 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 本地回放服务：模拟 CDN 返回记分板帧，支持 ETag / 304。
+# 由基准测试显式调用 advance() 推进帧，保证结果可复现。
+
+
+class ReplayServer:
+    def __init__(self, frames):
+        self.bodies = [json.dumps(frame, separators=(',', ':')).encode('utf-8') for frame in frames]
+        self.index = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.server = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_port}/todaysScoreboard_00.json'
+
+    def current(self):
+        with self.lock:
+            return self.index, self.bodies[self.index]
+
+    def advance(self):
+        with self.lock:
+            if self.index + 1 >= len(self.bodies):
+                return False
+            self.index += 1
+            return True
+
+    def start(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 头部与正文分开写出，关闭 Nagle 避免 keep-alive 下 40ms 的延迟确认等待
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                index, body = replay.current()
+                replay.requests += 1
+                etag = f'"frame-{index}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
@@ -0,0 +1,112 @@
+from PyQt5.QtCore import QObject, QPoint, QRect
+from PyQt5.QtGui import QGuiApplication
+
+# 贴边停靠：跟踪面板所在的屏幕并缓存各屏幕几何信息 (屏幕增减或分辨率变化时失效)，
+# 按面板所在屏幕计算隐藏 / 滑出位置。与相邻显示器相接的内侧边不会停靠，
+# 避免面板“藏”到另一块屏幕上。鼠标释放等高频路径只读缓存，不再查询系统。
+
+
+class EdgeDock(QObject):
+    def __init__(self, window, threshold=30, peek=15, margin=40):
+        super().__init__(window)
+        self.window = window
+        self.threshold = threshold # 距边缘多少像素内视为贴边
+        self.peek = peek           # 隐藏后露出的宽度
+        self.margin = margin       # 滑出后距边缘的距离
+
+        self._screen = None        # 面板当前所在屏幕
+        self._tracked_handle = None
+        self._geometries = None    # QScreen -> QRect 缓存
+        self._docked_screen = None # 隐藏时所在的屏幕，滑出时沿用
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+        for screen in app.screens():
+            screen.geometryChanged.connect(self.invalidate)
+
+    def invalidate(self, *args):
+        self._geometries = None
+
+    def _on_screen_added(self, screen):
+        screen.geometryChanged.connect(self.invalidate)
+        self.invalidate()
+
+    def _on_screen_removed(self, screen):
+        if screen is self._screen:
+            self._screen = None
+        if screen is self._docked_screen:
+            self._docked_screen = None
+        self.invalidate()
+
+    def _on_screen_changed(self, screen):
+        self._screen = screen
+
+    def geometries(self):
+        if self._geometries is None:
+            self._geometries = {screen: screen.geometry() for screen in QGuiApplication.screens()}
+        return self._geometries
+
+    def screen(self):
+        # 窗口句柄在首次显示后才存在，此后通过 screenChanged 跟踪所在屏幕
+        handle = self.window.windowHandle()
+        if handle is not None and handle is not self._tracked_handle:
+            self._tracked_handle = handle
+            handle.screenChanged.connect(self._on_screen_changed)
+            self._screen = handle.screen()
+        return self._screen or QGuiApplication.primaryScreen()
+
+    def geometry(self, screen=None):
+        geometries = self.geometries()
+        screen = screen or self.screen()
+        geometry = geometries.get(screen)
+        if geometry is None:
+            # 屏幕列表刚发生变化，重新读取一次
+            self.invalidate()
+            geometry = self.geometries().get(screen, QGuiApplication.primaryScreen().geometry())
+        return geometry
+
+    def _is_outer(self, point):
+        # 边缘外侧一像素不属于任何屏幕，才是可以停靠的外侧边
+        return not any(geometry.contains(point) for geometry in self.geometries().values())
+
+    def edge_at(self, rect):
+        # 返回面板贴近的外侧边 ('right' / 'left' / 'top' / 'bottom')，不贴边时返回 None
+        screen = self.geometry()
+        center = rect.center()
+        if rect.right() >= screen.right() - self.threshold and self._is_outer(QPoint(screen.right() + 1, center.y())):
+            return 'right'
+        if rect.left() <= screen.left() + self.threshold and self._is_outer(QPoint(screen.left() - 1, center.y())):
+            return 'left'
+        if rect.top() <= screen.top() + self.threshold and self._is_outer(QPoint(center.x(), screen.top() - 1)):
+            return 'top'
+        if rect.bottom() >= screen.bottom() - self.threshold and self._is_outer(QPoint(center.x(), screen.bottom() + 1)):
+            return 'bottom'
+        return None
+
+    def hide_target(self, rect, edge):
+        self._docked_screen = self.screen()
+        screen = self.geometry(self._docked_screen)
+        if edge == 'right':
+            return QRect(screen.right() + 1 - self.peek, rect.y(), rect.width(), rect.height())
+        if edge == 'left':
+            return QRect(screen.left() - rect.width() + self.peek, rect.y(), rect.width(), rect.height())
+        if edge == 'top':
+            return QRect(rect.x(), screen.top() - rect.height() + self.peek, rect.width(), rect.height())
+        return QRect(rect.x(), screen.bottom() + 1 - self.peek, rect.width(), rect.height())
+
+    def show_target(self, rect, edge):
+        screen = self.geometry(self._docked_screen)
+        self._docked_screen = None
+        if edge == 'right':
+            return QRect(screen.right() + 1 - rect.width() - self.margin, rect.y(), rect.width(), rect.height())
+        if edge == 'left':
+            return QRect(screen.left() + self.margin, rect.y(), rect.width(), rect.height())
+        if edge == 'top':
+            return QRect(rect.x(), screen.top() + self.margin, rect.width(), rect.height())
+        return QRect(rect.x(), screen.bottom() + 1 - rect.height() - self.margin, rect.width(), rect.height())
+
+    def initial_position(self, size, offset_x=20, offset_y=100):
+        # 主屏幕右上角
+        screen = self.geometry(QGuiApplication.primaryScreen())
+        return QPoint(screen.right() + 1 - size.width() - offset_x, screen.top() + offset_y)
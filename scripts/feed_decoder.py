@@ -0,0 +1,118 @@
+import json
+import os
+from typing import List, Optional, Union
+
+from game_model import Game, TeamLine
+
+# 记分板快速解码 (可选依赖)：
+# - msgspec：按只声明了所需字段的类型化结构解码，periods / gameLeaders / broadcasters / pbOdds
+#   等 _parse_game 不读取的子树在解析时直接跳过，不生成任何 Python 对象，随后直接构造 Game；
+# - orjson：仍生成完整的对象树，但解析速度约为标准库的数倍；
+# - 都未安装时回退到标准库 json，行为与原来一致。
+# NBA_SCORES_DECODER=msgspec / orjson / json 可强制指定后端 (未安装时忽略)。
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def available_backends():
+    backends = ['json']
+    if orjson is not None:
+        backends.insert(0, 'orjson')
+    if msgspec is not None:
+        backends.insert(0, 'msgspec')
+    return backends
+
+
+if msgspec is not None:
+    # 字段名与数据源一致，未声明的字段由 msgspec 跳过
+    class _TeamStruct(msgspec.Struct):
+        teamId: Union[int, str] = ''
+        teamName: str = ''
+        teamCity: str = ''
+        teamTricode: Optional[str] = ''
+        score: int = 0
+        wins: int = 0
+        losses: int = 0
+
+    class _GameStruct(msgspec.Struct):
+        gameId: str = ''
+        gameCode: str = ''
+        gameStatus: int = 0
+        gameStatusText: str = ''
+        gameTimeUTC: str = ''
+        period: Optional[int] = 0
+        gameClock: Optional[str] = ''
+        homeTeam: _TeamStruct = msgspec.field(default_factory=_TeamStruct)
+        awayTeam: _TeamStruct = msgspec.field(default_factory=_TeamStruct)
+
+    class _Scoreboard(msgspec.Struct):
+        games: List[_GameStruct] = []
+
+    class _Feed(msgspec.Struct):
+        scoreboard: Optional[_Scoreboard] = None
+
+
+def _team_from_struct(team):
+    return TeamLine(
+        team_id=team.teamId,
+        team_name=team.teamName,
+        team_city=team.teamCity,
+        team_tricode=team.teamTricode or '',
+        score=team.score,
+        wins=team.wins,
+        losses=team.losses
+    )
+
+
+def _game_from_struct(game):
+    # 与 Game.from_feed 的取值规则一致
+    return Game(
+        game_id=game.gameId,
+        game_code=game.gameCode,
+        game_status=game.gameStatus,
+        game_status_text=game.gameStatusText,
+        game_time=game.gameTimeUTC,
+        home_team=_team_from_struct(game.homeTeam),
+        away_team=_team_from_struct(game.awayTeam),
+        period=game.period or 0,
+        game_clock=game.gameClock or ''
+    )
+
+
+class FeedDecoder:
+    def __init__(self, backend=None):
+        backends = available_backends()
+        backend = backend or os.environ.get('NBA_SCORES_DECODER')
+        self.backend = backend if backend in backends else backends[0]
+        self.fallbacks = 0 # 类型化解码失败、改走通用路径的次数
+        self._feed_decoder = msgspec.json.Decoder(_Feed) if self.backend == 'msgspec' else None
+
+    def loads(self, content):
+        # 通用解码：返回完整的对象树 (用于技术统计、文字直播与中继格式)
+        if self.backend == 'json':
+            return json.loads(content)
+        if orjson is not None:
+            return orjson.loads(content)
+        return msgspec.json.decode(content)
+
+    def decode_games(self, content):
+        # 记分板直接解码为 [Game]；数据不是 CDN 记分板格式 (如中继服务) 或字段类型与预期不符时返回 None，
+        # 由调用方改用 loads() + 通用解析
+        if self._feed_decoder is None:
+            return None
+        try:
+            feed = self._feed_decoder.decode(content)
+        except msgspec.ValidationError:
+            self.fallbacks += 1
+            return None
+        if feed.scoreboard is None:
+            return None
+        return [_game_from_struct(game) for game in feed.scoreboard.games]
@@ -0,0 +1,59 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _FetchSignals(QObject):
+    # QRunnable 本身不是 QObject，需要借助一个信号载体把结果送回 GUI 线程
+    done = pyqtSignal(bool, object)
+
+
+class _FetchTask(QRunnable):
+    def __init__(self, api, signals):
+        super().__init__()
+        self.api = api
+        self.signals = signals
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            success, result = self.api.fetch_games()
+        except Exception as e:
+            success, result = False, f"获取NBA数据失败: {str(e)}"
+        self.signals.done.emit(success, result)
+
+
+# 后台拉取引擎：网络请求与解析在线程池中执行，结果通过信号回到 GUI 线程。
+# 同一时间最多只有一个请求在途，期间的刷新请求会并入当前请求，
+# 共享同一次 finished 信号，而不是重复发起网络请求。
+class FetchEngine(QObject):
+    started = pyqtSignal()
+    finished = pyqtSignal(bool, object)
+
+    def __init__(self, api, parent=None):
+        super().__init__(parent)
+        self.api = api
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.signals = _FetchSignals()
+        self.signals.done.connect(self._on_done)
+        self.in_flight = False
+
+    def refresh(self):
+        # 已有请求在途时直接并入，返回 False 表示未发起新请求
+        if self.in_flight:
+            return False
+
+        self.in_flight = True
+        self.started.emit()
+        self.pool.start(_FetchTask(self.api, self.signals))
+        return True
+
+    def is_busy(self):
+        return self.in_flight
+
+    def shutdown(self, timeout_ms=2000):
+        self.pool.clear()
+        self.pool.waitForDone(timeout_ms)
+
+    def _on_done(self, success, result):
+        self.in_flight = False
+        self.finished.emit(success, result)
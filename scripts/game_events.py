@@ -0,0 +1,132 @@
+from game_model import GameStatus
+
+# 比赛事件引擎：基于相邻两次快照的变更集 (ScoreboardDiff) 检测开赛、领先易主、
+# 末节胶着、加时与完赛等事件，只处理发生变化的比赛。
+# 去重状态随比赛离开记分板 (数据源切换到新的比赛日) 而清除，且有容量上限，长时间运行也不会无限增长；
+# 跨越午夜仍在进行的比赛保留去重状态，不会重复通知。
+
+TIPOFF = 'tipoff'
+LEAD_CHANGE = 'lead_change'
+CLOSE_GAME = 'close_game'
+OVERTIME = 'overtime'
+FINAL = 'final'
+
+ALL_EVENTS = (TIPOFF, LEAD_CHANGE, CLOSE_GAME, OVERTIME, FINAL)
+
+
+class GameEvent:
+    __slots__ = ('type', 'game', 'detail')
+
+    def __init__(self, type, game, detail=None):
+        self.type = type
+        self.game = game
+        self.detail = detail
+
+    def __repr__(self):
+        return f"GameEvent({self.type} {self.game!r} {self.detail!r})"
+
+
+class GameEventEngine:
+    MAX_DEDUP = 2048
+
+    def __init__(self, teams=None, events=None, close_margin=5, close_clock=300):
+        self.close_margin = close_margin # 分差不超过该值视为胶着
+        self.close_clock = close_clock   # 末节剩余秒数不超过该值才检测胶着
+        self.set_subscriptions(teams, events)
+
+        self._previous = {}  # game_id -> 上一次快照中的 Game
+        self._leader = {}    # game_id -> 上一次非平局时的领先方 ('home' / 'away')
+        self._fired = {}     # (game_id, 事件类型, 附加信息) -> None，按插入顺序淘汰
+
+    def set_subscriptions(self, teams=None, events=None):
+        # teams 为球队缩写集合，None 表示全部球队；events 为事件类型集合，None 表示全部事件
+        self.teams = frozenset(teams) if teams else None
+        self.events = frozenset(events) if events else frozenset(ALL_EVENTS)
+
+    def is_subscribed(self, event):
+        if event.type not in self.events:
+            return False
+        if self.teams is None:
+            return True
+        game = event.game
+        return game.home_team.team_tricode in self.teams or game.away_team.team_tricode in self.teams
+
+    def process(self, diff, emit=True):
+        # 处理一次刷新的变更集，返回订阅范围内的新事件列表。
+        # emit=False 时只记录状态 (用于首次加载，避免把历史状态当作新事件)。
+        if diff.removed:
+            self._forget(diff.removed)
+
+        events = []
+        for game_id in diff.changed_ids():
+            game = diff.games[game_id]
+            previous = self._previous.get(game_id)
+            self._previous[game_id] = game
+
+            for event in self._detect(previous, game):
+                key = (game_id, event.type, event.detail)
+                if key in self._fired:
+                    continue
+                self._remember(key)
+                if emit and self.is_subscribed(event):
+                    events.append(event)
+        return events
+
+    def _detect(self, previous, game):
+        events = []
+        old_status = previous.game_status if previous else None
+
+        if game.game_status == GameStatus.LIVE and old_status in (GameStatus.SCHEDULED, None):
+            if previous is not None:
+                events.append(GameEvent(TIPOFF, game))
+
+        if game.is_live:
+            leader = self._leader_of(game)
+            old_leader = self._leader.get(game.game_id)
+            if leader:
+                if old_leader and leader != old_leader:
+                    # 领先易主次数不固定，以当前比分区分每一次
+                    events.append(GameEvent(LEAD_CHANGE, game, game.score))
+                self._leader[game.game_id] = leader
+
+            if game.period > 4 and (previous is None or previous.period != game.period):
+                events.append(GameEvent(OVERTIME, game, game.period))
+
+            if game.period >= 4 and self._is_close(game):
+                events.append(GameEvent(CLOSE_GAME, game, game.period))
+
+        if game.is_finished and old_status != GameStatus.FINISHED:
+            events.append(GameEvent(FINAL, game))
+            self._leader.pop(game.game_id, None)
+
+        return events
+
+    @staticmethod
+    def _leader_of(game):
+        away, home = game.score
+        if home > away:
+            return 'home'
+        if away > home:
+            return 'away'
+        return None
+
+    def _is_close(self, game):
+        away, home = game.score
+        if abs(home - away) > self.close_margin:
+            return False
+        seconds = game.clock_seconds
+        return seconds is None or seconds <= self.close_clock
+
+    def _remember(self, key):
+        if len(self._fired) >= self.MAX_DEDUP:
+            self._fired.pop(next(iter(self._fired)))
+        self._fired[key] = None
+
+    def _forget(self, game_ids):
+        # 比赛已从记分板移除，不会再产生事件：清除它的全部状态
+        removed = set(game_ids)
+        for game_id in removed:
+            self._previous.pop(game_id, None)
+            self._leader.pop(game_id, None)
+        for key in [key for key in self._fired if key[0] in removed]:
+            del self._fired[key]
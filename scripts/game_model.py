@@ -0,0 +1,202 @@
+import sys
+from enum import IntEnum
+
+# 紧凑的比赛数据模型：使用 __slots__ 代替嵌套 dict，减少每次刷新的内存分配，
+# 并预先计算哈希，前后快照之间的比较只需逐字段比较。
+
+
+# 联赛代码：即 game_id 的前两位，也是 todaysScoreboard_XX.json 的后缀
+LEAGUES = {'00': 'NBA', '10': 'WNBA', '20': 'G League'}
+
+
+class GameStatus(IntEnum):
+    UNKNOWN = 0
+    SCHEDULED = 1
+    LIVE = 2
+    FINISHED = 3
+
+    @classmethod
+    def from_code(cls, code):
+        try:
+            return cls(code)
+        except ValueError:
+            return cls.UNKNOWN
+
+
+_FIELDS_TEAM = ('team_id', 'team_name', 'team_city', 'team_tricode', 'score', 'wins', 'losses')
+_FIELDS_GAME = ('game_id', 'game_code', 'game_status', 'game_status_text', 'game_time', 'home_team', 'away_team',
+                'period', 'game_clock')
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 为只读对象")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} 为只读对象")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._hash == other._hash and self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return self._hash
+
+    def _init_fields(self, fields, values):
+        for name, value in zip(fields, values):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_hash', hash(self._key()))
+
+
+class TeamLine(_Frozen):
+    __slots__ = _FIELDS_TEAM + ('_hash',)
+
+    def __init__(self, team_id='', team_name='', team_city='', team_tricode='', score=0, wins=0, losses=0):
+        # 球队缩写只有几十种取值，驻留后各快照共享同一个字符串对象
+        self._init_fields(_FIELDS_TEAM, (team_id, team_name, team_city, sys.intern(team_tricode),
+                                         score, wins, losses))
+
+    @classmethod
+    def from_feed(cls, team):
+        return cls(
+            team_id=team.get('teamId', ''),
+            team_name=team.get('teamName', ''),
+            team_city=team.get('teamCity', ''),
+            team_tricode=team.get('teamTricode', '') or '',
+            score=team.get('score', 0),
+            wins=team.get('wins', 0),
+            losses=team.get('losses', 0)
+        )
+
+    def _key(self):
+        return (self.team_id, self.team_tricode, self.score, self.wins, self.losses,
+                self.team_name, self.team_city)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in _FIELDS_TEAM}
+
+    def __repr__(self):
+        return f"TeamLine({self.team_tricode} {self.score})"
+
+
+class Game(_Frozen):
+    __slots__ = _FIELDS_GAME + ('is_live', 'is_finished', '_hash')
+
+    def __init__(self, game_id='', game_code='', game_status=0, game_status_text='', game_time='',
+                 home_team=None, away_team=None, period=0, game_clock=''):
+        status = GameStatus.from_code(game_status)
+        self._init_fields(_FIELDS_GAME, (game_id, game_code, status, game_status_text, game_time,
+                                         home_team or TeamLine(), away_team or TeamLine(),
+                                         period, game_clock))
+        object.__setattr__(self, 'is_live', status == GameStatus.LIVE)
+        object.__setattr__(self, 'is_finished', status == GameStatus.FINISHED)
+
+    @classmethod
+    def from_feed(cls, game):
+        return cls(
+            game_id=game.get('gameId', ''),
+            game_code=game.get('gameCode', ''),
+            game_status=game.get('gameStatus', 0),
+            game_status_text=game.get('gameStatusText', ''),
+            game_time=game.get('gameTimeUTC', ''),
+            home_team=TeamLine.from_feed(game.get('homeTeam', {})),
+            away_team=TeamLine.from_feed(game.get('awayTeam', {})),
+            period=game.get('period', 0) or 0,
+            game_clock=game.get('gameClock', '') or ''
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        # to_dict 的逆操作，用于从缓存/中继服务恢复
+        return cls(
+            game_id=data.get('game_id', ''),
+            game_code=data.get('game_code', ''),
+            game_status=data.get('game_status', 0),
+            game_status_text=data.get('game_status_text', ''),
+            game_time=data.get('game_time', ''),
+            home_team=TeamLine(**data.get('home_team', {})),
+            away_team=TeamLine(**data.get('away_team', {})),
+            period=data.get('period', 0),
+            game_clock=data.get('game_clock', '')
+        )
+
+    def _key(self):
+        return (self.game_id, self.game_status, self.game_status_text, self.home_team, self.away_team,
+                self.period, self.game_clock, self.game_time, self.game_code)
+
+    @property
+    def score(self):
+        return (self.away_team.score, self.home_team.score)
+
+    @property
+    def league_id(self):
+        # 编号不符合 CDN 规则 (如测试数据) 的比赛视为 NBA
+        league_id = self.game_id[:2]
+        return league_id if league_id in LEAGUES else '00'
+
+    @property
+    def clock_seconds(self):
+        # gameClock 为 ISO8601 时长，如 "PT04M31.00S"；无法解析时返回 None
+        clock = self.game_clock
+        if not clock.startswith('PT'):
+            return None
+        try:
+            minutes, _, seconds = clock[2:].rstrip('S').partition('M')
+            return int(minutes or 0) * 60 + float(seconds or 0)
+        except ValueError:
+            return None
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in _FIELDS_GAME}
+        data['game_status'] = int(self.game_status)
+        data['home_team'] = self.home_team.to_dict()
+        data['away_team'] = self.away_team.to_dict()
+        data['is_live'] = self.is_live
+        data['is_finished'] = self.is_finished
+        return data
+
+    def __repr__(self):
+        return (f"Game({self.game_id} {self.away_team.team_tricode} {self.away_team.score}"
+                f"-{self.home_team.score} {self.home_team.team_tricode} {self.game_status.name})")
+
+
+_FIELDS_ACTION = ('action_number', 'period', 'clock', 'team_tricode', 'action_type', 'description',
+                  'score_home', 'score_away')
+
+
+class PlayAction(_Frozen):
+    __slots__ = _FIELDS_ACTION + ('_hash',)
+
+    def __init__(self, action_number=0, period=0, clock='', team_tricode='', action_type='', description='',
+                 score_home=0, score_away=0):
+        self._init_fields(_FIELDS_ACTION, (action_number, period, clock, sys.intern(team_tricode),
+                                           sys.intern(action_type), description, score_home, score_away))
+
+    @classmethod
+    def from_feed(cls, action):
+        return cls(
+            action_number=action.get('actionNumber', 0),
+            period=action.get('period', 0),
+            clock=action.get('clock', ''),
+            team_tricode=action.get('teamTricode', '') or '',
+            action_type=action.get('actionType', '') or '',
+            description=action.get('description', ''),
+            score_home=int(action.get('scoreHome') or 0),
+            score_away=int(action.get('scoreAway') or 0)
+        )
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in _FIELDS_ACTION)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in _FIELDS_ACTION}
+
+    def __repr__(self):
+        return f"PlayAction(#{self.action_number} Q{self.period} {self.clock} {self.description})"
@@ -0,0 +1,129 @@
+import os
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QBrush, QColor, QFont, QGuiApplication, QIcon, QPainter, QPainterPath, QPen, QPixmap
+
+from snapshot_cache import default_cache_dir
+
+# 图标渲染缓存：奖杯图标按 (尺寸, DPI 缩放, 角标) 缓存渲染结果，并把 PNG 持久化到磁盘，
+# 托盘角标 (进行中场数) 每次刷新只需查表，高 DPI 屏幕按物理像素渲染保持清晰。
+# 修改绘制代码后需递增 ICON_VERSION，使磁盘上的旧图标失效。
+
+ICON_VERSION = 1
+ICON_SIZES = (16, 24, 32, 48, 64)
+BASE_SIZE = 64 # 绘制坐标系 (与最初的 64x64 手绘图标一致)
+
+
+def badge_text(count):
+    # 角标文字：0 不显示角标，超过 9 显示 9+
+    if not count:
+        return None
+    return str(count) if count < 10 else '9+'
+
+
+class IconRenderer:
+    MAX_PIXMAPS = 256
+
+    def __init__(self, cache_dir=None, persist=True):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), 'icons')
+        self.persist = persist
+        self._pixmaps = {} # (size, scale, badge) -> QPixmap
+        self._icons = {}   # (scale, badge) -> QIcon
+
+    @staticmethod
+    def device_scale():
+        app = QGuiApplication.instance()
+        screen = app.primaryScreen() if app else None
+        return screen.devicePixelRatio() if screen else 1.0
+
+    def _path(self, size, scale, badge):
+        suffix = f"_{badge.replace('+', 'p')}" if badge else ''
+        return os.path.join(self.cache_dir, f"trophy_v{ICON_VERSION}_{size}@{scale:g}x{suffix}.png")
+
+    def pixmap(self, size=BASE_SIZE, scale=None, badge=None):
+        scale = scale or self.device_scale()
+        key = (size, scale, badge)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        path = self._path(size, scale, badge)
+        pixmap = QPixmap()
+        if not (self.persist and pixmap.load(path)):
+            pixmap = self.render(size, scale, badge)
+            if self.persist:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    pixmap.save(path, 'PNG')
+                except OSError as e:
+                    print(f"写入图标缓存失败: {e}")
+        pixmap.setDevicePixelRatio(scale)
+
+        if len(self._pixmaps) >= self.MAX_PIXMAPS:
+            self._pixmaps.clear()
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def icon(self, badge=None, scale=None):
+        # 包含常用尺寸的 QIcon，托盘与窗口按需选取最合适的一张
+        scale = scale or self.device_scale()
+        key = (scale, badge)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = QIcon()
+            for size in ICON_SIZES:
+                icon.addPixmap(self.pixmap(size, scale, badge))
+            self._icons[key] = icon
+        return icon
+
+    @staticmethod
+    def render(size, scale=1.0, badge=None):
+        pixels = max(1, round(size * scale))
+        pixmap = QPixmap(pixels, pixels)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(pixels / BASE_SIZE, pixels / BASE_SIZE)
+
+        # 1. 绘制背景圆 (使用路径数据中的灰色 #696065)
+        painter.setBrush(QBrush(QColor("#696065")))
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(0, 0, 64, 64)
+
+        # 2. 绘制奖杯图案 (黄色 #FBB01F)
+        painter.setBrush(QBrush(QColor("#FBB01F")))
+
+        # 奖杯底座
+        painter.drawRect(20, 48, 24, 6)
+        painter.drawRect(26, 42, 12, 6)
+
+        # 奖杯杯身 (倒梯形 + 半圆)
+        path_cup = QPainterPath()
+        path_cup.moveTo(16, 16)
+        path_cup.lineTo(48, 16)
+        path_cup.lineTo(40, 36)
+        path_cup.lineTo(24, 36)
+        path_cup.closeSubpath()
+        painter.drawPath(path_cup)
+
+        # 奖杯把手 (左右圆弧)
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(QColor("#FBB01F"), 3))
+        painter.drawArc(12, 18, 10, 10, 90*16, 180*16)
+        painter.drawArc(42, 18, 10, 10, -90*16, 180*16)
+
+        # 3. 角标：右上角红底白字 (进行中场数)
+        if badge:
+            rect = QRectF(30, 0, 34, 34)
+            painter.setPen(QPen(QColor("#0f172a"), 2))
+            painter.setBrush(QBrush(QColor("#ef4444")))
+            painter.drawEllipse(rect)
+            font = QFont("Segoe UI")
+            font.setPixelSize(22 if len(badge) == 1 else 17)
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(rect, Qt.AlignCenter, badge)
+
+        painter.end()
+        return pixmap
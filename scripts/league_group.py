@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from feed_decoder import FeedDecoder
+from game_model import LEAGUES
+from metrics import NULL_METRICS
+from nba_api import NBAApi
+from scoreboard_diff import ScoreboardDiff, diff_games
+
+# 多联赛轮询：NBA / WNBA / G League 各由一个 NBAApi 负责 (各自的 ETag 与熔断器)，
+# 共用同一个连接池与解码器，每次刷新并发拉取所有联赛并合并为一份记分板。
+# 对外接口与 NBAApi 一致 (fetch_games / games / last_diff / breaker ...)，
+# 面板、中继服务和命令行沿用同一个轮询调度器，无需区分单联赛还是多联赛。
+# NBA_SCORES_LEAGUES=nba,wnba,gleague (或 00,10,20) 指定关注的联赛，默认只有 NBA。
+
+LEAGUE_ALIASES = {'nba': '00', 'wnba': '10', 'gleague': '20', 'g-league': '20', 'g': '20'}
+
+
+def parse_leagues(text, default=('00',)):
+    # 按书写顺序返回联赛代码 (面板分组也按此顺序)，无法识别的名称忽略
+    leagues = []
+    for item in (text or '').split(','):
+        item = item.strip().lower().replace(' ', '')
+        if not item:
+            continue
+        league_id = LEAGUE_ALIASES.get(item, item)
+        if league_id not in LEAGUES:
+            print(f"未知联赛: {item}")
+        elif league_id not in leagues:
+            leagues.append(league_id)
+    return leagues or list(default)
+
+
+def create_api(league_ids, base_url=None, cache=None, metrics=None, long_poll=False):
+    # 指定了数据地址 (中继服务 / 自定义上游) 或只关注一个联赛时直接使用 NBAApi
+    if base_url or len(league_ids) == 1:
+        return NBAApi(cache=cache, base_url=base_url, metrics=metrics, league_id=league_ids[0],
+                      long_poll=long_poll)
+    return LeagueGroup(league_ids, cache=cache, metrics=metrics)
+
+
+class _GroupBreaker:
+    # 还有联赛可以请求就不暂停轮询：取各联赛熔断剩余时间的最小值
+    def __init__(self, apis):
+        self.apis = apis
+
+    def retry_after(self):
+        return min(api.breaker.retry_after() for api in self.apis)
+
+
+class LeagueGroup:
+    def __init__(self, league_ids, cache=None, metrics=None, decoder=None):
+        self.league_ids = list(league_ids)
+        self.cache = cache # 合并后的快照落盘 (格式与 NBAApi 相同)
+        self.history = None # 可选的 ScoreHistory，按合并后的变更集记录
+        self.metrics = metrics or NULL_METRICS
+        self.session = NBAApi.create_session(max(NBAApi.RANGE_WORKERS, len(self.league_ids)))
+        decoder = decoder or FeedDecoder()
+        self.apis = [NBAApi(metrics=self.metrics, decoder=decoder, league_id=league_id, session=self.session)
+                     for league_id in self.league_ids]
+        self.breaker = _GroupBreaker(self.apis)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.apis), thread_name_prefix='league')
+
+        self.games = []
+        self.last_updated = None
+        self.is_stale = False
+        self.not_modified = False
+        self.last_error = None     # 所有联赛都未能正常刷新时的失败原因 (调用方据此退避)
+        self.league_errors = None  # 部分联赛失败时的原因，其余联赛照常按比赛状态轮询
+        self.last_diff = ScoreboardDiff()
+
+    @property
+    def response_counts(self):
+        counts = {}
+        for api in self.apis:
+            for status, count in api.response_counts.items():
+                counts[status] = counts.get(status, 0) + count
+        return counts
+
+    @property
+    def bytes_downloaded(self):
+        return sum(api.bytes_downloaded for api in self.apis)
+
+    def fetch_games(self):
+        # 各联赛并发请求；单个联赛失败时沿用它上一次的数据，全部失败且没有数据时才返回失败
+        results = list(self.executor.map(lambda api: api.fetch_games(), self.apis))
+
+        errors = []
+        healthy = False
+        fresh = False
+        for api, (success, result) in zip(self.apis, results):
+            if not success:
+                errors.append(f"{LEAGUES[api.league_id]} {result}")
+            elif api.last_error:
+                errors.append(f"{LEAGUES[api.league_id]} {api.last_error}")
+            else:
+                healthy = True
+                fresh = fresh or not api.not_modified
+        message = '；'.join(errors) or None
+        self.last_error = None if healthy else message
+        self.league_errors = message if healthy else None
+
+        games = [game for api in self.apis for game in api.games]
+        if not games and not any(success for success, _ in results):
+            return False, self.last_error
+
+        with self.metrics.stage('diff'):
+            self.last_diff = diff_games(self.games, games)
+        self.games = games
+        self.not_modified = not fresh and not errors
+        self.is_stale = any(api.is_stale for api in self.apis)
+        updated = [api.last_updated for api in self.apis if api.last_updated]
+        self.last_updated = max(updated) if updated else None
+        if fresh and self.cache:
+            self.cache.save(self.games, None, None, self.last_updated)
+        if fresh and self.history:
+            self.history.record(self.last_diff, self.last_updated)
+        return True, self.games
+
+    def load_snapshot(self, snapshot=None):
+        # 合并快照不含各联赛的校验值，启动后每个联赛的首次请求会返回完整数据
+        if snapshot is None and self.cache:
+            snapshot = self.cache.load()
+        if snapshot is None:
+            return False
+
+        games, _, _, fetched_at = snapshot
+        for api in self.apis:
+            api.load_snapshot(([game for game in games if game.league_id == api.league_id], None, None, fetched_at))
+        self.games = [game for api in self.apis for game in api.games]
+        self.last_updated = fetched_at
+        self.is_stale = True
+        return True
+
+    def get_response_counts(self):
+        return self.response_counts
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        for api in self.apis:
+            api.close()
+        self.session.close()
@@ -0,0 +1,174 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 刷新链路性能指标 (按需开启)：记录每次刷新各阶段耗时、列表更新行数、
+# 下载字节数与 HTTP 状态分布，并以日志行、调试浮层和 Prometheus 文本格式输出。
+# 设置环境变量 NBA_SCORES_METRICS=1 开启，NBA_SCORES_METRICS_PORT=9108 同时开启 /metrics 端点。
+
+STAGES = ('network', 'decode', 'parse', 'diff', 'update_ui')
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullMetrics:
+    # 未开启时的空实现，埋点处无需判断
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, value=1):
+        pass
+
+    def observe_response(self, status, size):
+        pass
+
+    def gauge(self, name, value):
+        pass
+
+    def end_refresh(self):
+        return None
+
+
+NULL_METRICS = NullMetrics()
+
+
+class RefreshMetrics:
+    enabled = True
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = {}       # 本次刷新各阶段耗时 (秒)
+        self.last = {}          # 上一次完成的刷新
+        self.stage_totals = {}  # 阶段 -> [累计秒数, 次数]
+        self.counters = {}      # rows_updated / refreshes ...
+        self.gauges = {}        # startup_first_paint_ms ... (只保留最新值)
+        self.status_counts = {} # HTTP 状态码 -> 次数
+        self.bytes_downloaded = 0
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.current[name] = self.current.get(name, 0.0) + elapsed
+                total = self.stage_totals.setdefault(name, [0.0, 0])
+                total[0] += elapsed
+                total[1] += 1
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_response(self, status, size):
+        with self.lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            self.bytes_downloaded += size
+
+    def gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def end_refresh(self):
+        # 结束一次刷新，返回本次的阶段耗时并输出一行日志
+        with self.lock:
+            self.last = self.current
+            self.current = {}
+            self.counters['refreshes'] = self.counters.get('refreshes', 0) + 1
+        print(self.log_line())
+        return self.last
+
+    def log_line(self):
+        with self.lock:
+            stages = ' '.join(f"{name}={self.last[name] * 1000:.1f}ms" for name in STAGES if name in self.last)
+            return (f"[refresh #{self.counters.get('refreshes', 0)}] {stages} "
+                    f"rows={self.counters.get('rows_updated', 0)} "
+                    f"bytes={self.bytes_downloaded} "
+                    f"http={dict(sorted(self.status_counts.items()))}")
+
+    def overlay_text(self):
+        with self.lock:
+            lines = [f"{name:<9} {self.last[name] * 1000:7.1f} ms" for name in STAGES if name in self.last]
+            lines.append(f"rows      {self.counters.get('rows_updated', 0)}")
+            lines.append(f"bytes     {self.bytes_downloaded}")
+            lines.append("http      " + ' '.join(f"{status}:{count}"
+                                                  for status, count in sorted(self.status_counts.items())))
+            return '\n'.join(lines)
+
+    def render_prometheus(self):
+        with self.lock:
+            lines = [
+                '# HELP nba_scores_stage_seconds_total 刷新各阶段累计耗时',
+                '# TYPE nba_scores_stage_seconds_total counter'
+            ]
+            for name, (seconds, _) in sorted(self.stage_totals.items()):
+                lines.append(f'nba_scores_stage_seconds_total{{stage="{name}"}} {seconds:.6f}')
+            lines += ['# TYPE nba_scores_stage_calls_total counter']
+            for name, (_, calls) in sorted(self.stage_totals.items()):
+                lines.append(f'nba_scores_stage_calls_total{{stage="{name}"}} {calls}')
+            lines += ['# TYPE nba_scores_stage_last_seconds gauge']
+            for name, seconds in sorted(self.last.items()):
+                lines.append(f'nba_scores_stage_last_seconds{{stage="{name}"}} {seconds:.6f}')
+            lines += ['# TYPE nba_scores_http_responses_total counter']
+            for status, count in sorted(self.status_counts.items()):
+                lines.append(f'nba_scores_http_responses_total{{status="{status}"}} {count}')
+            lines += ['# TYPE nba_scores_bytes_downloaded_total counter',
+                      f'nba_scores_bytes_downloaded_total {self.bytes_downloaded}']
+            for name, value in sorted(self.counters.items()):
+                lines += [f'# TYPE nba_scores_{name}_total counter', f'nba_scores_{name}_total {value}']
+            for name, value in sorted(self.gauges.items()):
+                lines += [f'# TYPE nba_scores_{name} gauge', f'nba_scores_{name} {value:.3f}']
+            return '\n'.join(lines) + '\n'
+
+
+def serve_metrics(metrics, port, host='127.0.0.1'):
+    # 在后台线程提供 Prometheus 文本格式的 /metrics 端点 (http.server 按需导入，不影响启动耗时)
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def metrics_from_env():
+    # 根据环境变量创建指标对象；未开启时返回 NULL_METRICS
+    if os.environ.get('NBA_SCORES_METRICS') not in ('1', 'true', 'yes'):
+        return NULL_METRICS, None
+
+    metrics = RefreshMetrics()
+    server = None
+    port = os.environ.get('NBA_SCORES_METRICS_PORT')
+    if port:
+        try:
+            server = serve_metrics(metrics, int(port))
+        except (OSError, ValueError) as e:
+            print(f"指标端点启动失败: {e}")
+    return metrics, server
@@ -1,84 +1,354 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
-from dateutil import parser as date_parser
+from game_model import Game, PlayAction
+from scoreboard_diff import ScoreboardDiff, diff_games
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from metrics import NULL_METRICS
+from feed_decoder import FeedDecoder
 
 class NBAApi:
-    BASE_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+    # 各联赛 (game_model.LEAGUES) 的今日记分板，league_id 为 00 / 10 / 20
+    SCOREBOARD_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_{league_id}.json"
+    BASE_URL = SCOREBOARD_URL.format(league_id='00')
+    BOXSCORE_URL = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
+    PLAY_BY_PLAY_URL = "https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+    # 按日期查询的记分板 (stats.nba.com)，返回结构与 todaysScoreboard 相同
+    SCOREBOARD_BY_DATE_URL = "https://stats.nba.com/stats/scoreboardv3?GameDate={date}&LeagueID={league_id}"
+    STATS_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+        'Referer': 'https://www.nba.com/',
+        'Origin': 'https://www.nba.com',
+        'Accept': 'application/json'
+    }
+    TIMEOUT = 10
+    RELAY_STALE_MESSAGE = "中继服务无法访问上游数据源"
+    RELAY_WAIT = 8 # 中继长轮询的挂起时长 (秒)，小于 TIMEOUT，退出时等待在途请求的时间不超过原来
+    DETAIL_CACHE_SIZE = 32
+    RANGE_WORKERS = 4
     
-    def __init__(self):
+    def __init__(self, cache=None, base_url=None, metrics=None, decoder=None, league_id='00', session=None,
+                 long_poll=False):
+        # base_url 可指向本地中继服务 (nba_relay.py)，多个客户端共享同一个上游轮询；
+        # long_poll=True 时使用中继的长轮询 (?wait=)，数据变化后请求立即返回
+        self.league_id = league_id
+        self.long_poll = long_poll
+        # NBA 仍读取 BASE_URL，覆盖该属性 (如基准测试指向回放服务) 的用法保持有效
+        self.base_url = base_url or (self.BASE_URL if league_id == '00'
+                                     else self.SCOREBOARD_URL.format(league_id=league_id))
         self.games = []
         self.last_updated = None
+        self.cache = cache # 可选的 SnapshotCache，成功拉取后落盘
+        self.is_stale = False # 当前数据是否来自磁盘缓存、尚未被网络数据确认
+        self.metrics = metrics or NULL_METRICS # 可选的刷新链路性能指标
+        self.decoder = decoder or FeedDecoder() # JSON 解码后端 (msgspec / orjson / 标准库)
+        
+        # 复用连接池：保持 keep-alive，避免每次轮询都重新建立 TCP + TLS 连接；
+        # 多联赛轮询时由 LeagueGroup 传入共享的 session
+        self.owns_session = session is None
+        self.session = session or self.create_session(self.RANGE_WORKERS)
+        
+        # 条件请求校验值，数据未变化时服务端返回 304
+        self.etag = None
+        self.last_modified = None
+        self.not_modified = False # 最近一次请求是否命中 304
+        self.last_diff = ScoreboardDiff() # 最近一次刷新相对上一次快照的变更集
+        
+        # 容错：单次刷新内有限重试，连续失败后熔断暂停请求
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.last_error = None # 最近一次失败原因，成功后清空
+        self.upstream_stale = False # 中继报告其上游不可用，返回的是中继最后一次成功拉取的数据
+        # 技术统计 / 文字直播使用独立熔断器，单场比赛数据不可用不影响记分板轮询
+        self.detail_breaker = CircuitBreaker()
+        self.history_breaker = CircuitBreaker()
+        self.day_cache = None # 可选的 DayCache，缓存已完赛的历史日期
+        self.history = None # 可选的 ScoreHistory，记录每场比赛的比分变化
+        self.last_range_errors = {}
+        
+        # 单场比赛数据：url -> (etag, 解析结果)；game_id -> 文字直播增量状态
+        self.detail_cache = {}
+        self.pbp_streams = {}
+        
+        # 响应统计
+        self.response_counts = {200: 0, 304: 0}
+        self.bytes_downloaded = 0
+    
+    @staticmethod
+    def create_session(pool_size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _get(self, url, headers=None):
+        response = self.session.get(url, headers=headers, timeout=self.TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+    
+    def _request(self, url, headers=None, breaker=None):
+        # 经过熔断器与重试策略的 GET 请求
+        breaker = breaker or self.breaker
+        if not breaker.allow_request():
+            raise CircuitOpenError(breaker.retry_after())
+        try:
+            response = self.retry_policy.call(lambda: self._get(url, headers))
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return response
+    
+    def _fetch_detail(self, url, keep_data=True):
+        # 单场数据的条件请求：返回 (是否有新数据, JSON)，304 时返回缓存的上一次结果；
+        # keep_data=False 时只保存 ETag，不在内存中保留整份文档
+        cached = self.detail_cache.get(url)
+        headers = {'If-None-Match': cached[0]} if cached and cached[0] else None
+        
+        response = self._request(url, headers, self.detail_breaker)
+        if response.status_code == 304:
+            self.response_counts[304] += 1
+            return False, cached[1]
+        
+        self.response_counts[response.status_code] = self.response_counts.get(response.status_code, 0) + 1
+        self.bytes_downloaded += len(response.content)
+        data = self.decoder.loads(response.content)
+        
+        self.detail_cache.pop(url, None)
+        if len(self.detail_cache) >= self.DETAIL_CACHE_SIZE:
+            # 按插入顺序淘汰最早的条目
+            self.detail_cache.pop(next(iter(self.detail_cache)))
+        self.detail_cache[url] = (response.headers.get('ETag'), data if keep_data else None)
+        return True, data
+    
+    def fetch_boxscore(self, game_id):
+        try:
+            changed, data = self._fetch_detail(self.BOXSCORE_URL.format(game_id=game_id))
+            return True, data.get('game', {})
+        except requests.RequestException as e:
+            return False, f"获取技术统计失败: {str(e)}"
+        except Exception as e:
+            return False, f"解析技术统计失败: {str(e)}"
+    
+    def fetch_play_by_play(self, game_id):
+        # 增量文字直播：只返回上次之后新增的事件 (按 actionNumber)。
+        # 文档本身仍需完整下载，但已处理过的事件不再重复解析；304 时直接返回空列表。
+        last_action = self.pbp_streams.get(game_id, 0)
+        try:
+            changed, data = self._fetch_detail(self.PLAY_BY_PLAY_URL.format(game_id=game_id), keep_data=False)
+            if not changed:
+                return True, []
+            
+            actions = data.get('game', {}).get('actions', [])
+            # 事件按 actionNumber 递增排列，从末尾向前找到上次的位置，代价只与新增事件数有关
+            start = len(actions)
+            while start > 0 and actions[start - 1].get('actionNumber', 0) > last_action:
+                start -= 1
+            
+            new_actions = [PlayAction.from_feed(action) for action in actions[start:]]
+            if new_actions:
+                self.pbp_streams[game_id] = new_actions[-1].action_number
+            return True, new_actions
+        except requests.RequestException as e:
+            return False, f"获取文字直播失败: {str(e)}"
+        except Exception as e:
+            return False, f"解析文字直播失败: {str(e)}"
+    
+    def _fetch_day(self, day):
+        url = self.SCOREBOARD_BY_DATE_URL.format(date=day.isoformat(), league_id=self.league_id)
+        response = self._request(url, self.STATS_HEADERS, self.history_breaker)
+        self.bytes_downloaded += len(response.content)
+        games = self.decoder.decode_games(response.content)
+        if games is not None:
+            return games
+        
+        data = self.decoder.loads(response.content)
+        games = []
+        for game in data.get('scoreboard', {}).get('games', []):
+            game_info = self._parse_game(game)
+            if game_info:
+                games.append(game_info)
+        return games
+    
+    def fetch_range(self, start_date, end_date, max_workers=None):
+        # 拉取 [start_date, end_date] 内每天的比赛，返回 (True, {date: [Game]})，失败的日期记录在 last_range_errors。
+        # 已完赛的日期从 day_cache 读取且永久缓存，只有仍可能变化的日期才会发起请求；
+        # 请求通过有界线程池并发执行。
+        days = []
+        day = start_date
+        while day <= end_date:
+            days.append(day)
+            day += timedelta(days=1)
+        
+        results = {}
+        pending = []
+        for day in days:
+            cached = self.day_cache.load(day) if self.day_cache else None
+            if cached is not None:
+                results[day] = cached
+            else:
+                pending.append(day)
+        
+        errors = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=max_workers or self.RANGE_WORKERS) as executor:
+                futures = {day: executor.submit(self._fetch_day, day) for day in pending}
+                for day, future in futures.items():
+                    try:
+                        games = future.result()
+                    except Exception as e:
+                        errors[day] = f"获取 {day.isoformat()} 比赛失败: {str(e)}"
+                        continue
+                    results[day] = games
+                    if self.day_cache and self.day_cache.is_final(day, games):
+                        self.day_cache.save(day, games)
+        
+        self.last_range_errors = errors
+        ordered = {day: results[day] for day in days if day in results}
+        if errors and not ordered:
+            return False, next(iter(errors.values()))
+        return True, ordered
+    
+    def reset_play_by_play(self, game_id):
+        # 丢弃某场比赛的增量状态，下次从头返回全部事件
+        self.pbp_streams.pop(game_id, None)
+        self.detail_cache.pop(self.PLAY_BY_PLAY_URL.format(game_id=game_id), None)
+    
+    def _serve_stale(self, message):
+        # 请求失败时若有上一次的有效数据则继续提供 (标记为过期)，避免界面切换到错误状态
+        self.last_error = message
+        self.not_modified = False
+        if not self.games:
+            return False, message
+        
+        self.is_stale = True
+        self.last_diff = ScoreboardDiff()
+        return True, self.games
     
     def fetch_games(self):
         try:
-            response = requests.get(self.BASE_URL, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            headers = {}
+            if self.etag:
+                headers['If-None-Match'] = self.etag
+            if self.last_modified:
+                headers['If-Modified-Since'] = self.last_modified
+            
+            url = self.base_url
+            if self.long_poll and self.etag:
+                # 中继挂起请求直到数据变化 (200) 或超时 (304)
+                url = f"{url}{'&' if '?' in url else '?'}wait={self.RELAY_WAIT}"
+            with self.metrics.stage('network'):
+                response = self._request(url, headers)
+            self.last_error = None
+            self.metrics.observe_response(response.status_code, len(response.content))
+            
+            if response.status_code == 304:
+                # 数据未变化，跳过解析，沿用上一次的结果
+                self.response_counts[304] += 1
+                self.not_modified = True
+                self.last_diff = diff_games(self.games, self.games)
+                if self.upstream_stale:
+                    # 中继仍未恢复上游：数据依旧是离线数据
+                    self.is_stale = True
+                    self.last_error = self.RELAY_STALE_MESSAGE
+                    return True, self.games
+                self.last_updated = datetime.now()
+                self.is_stale = False
+                return True, self.games
             
-            self.games = []
-            scoreboard = data.get('scoreboard', {})
-            games = scoreboard.get('games', [])
+            self.response_counts[response.status_code] = self.response_counts.get(response.status_code, 0) + 1
+            self.bytes_downloaded += len(response.content)
+            # 类型化解码直接得到 [Game] (解码与解析合并计入 decode 阶段)；不支持时解码为对象树再解析
+            data = None
+            with self.metrics.stage('decode'):
+                parsed_games = self.decoder.decode_games(response.content)
+                if parsed_games is None:
+                    data = self.decoder.loads(response.content)
             
-            for game in games:
-                game_info = self._parse_game(game)
-                if game_info:
-                    self.games.append(game_info)
+            self.etag = response.headers.get('ETag')
+            self.last_modified = response.headers.get('Last-Modified')
+            self.not_modified = False
             
+            # 先在局部列表中解析完成再整体替换，后台线程拉取时 GUI 线程不会读到半成品
+            if parsed_games is None:
+                with self.metrics.stage('parse'):
+                    parsed_games = self._parse_payload(data)
+            
+            with self.metrics.stage('diff'):
+                self.last_diff = diff_games(self.games, parsed_games)
+            self.games = parsed_games
             self.last_updated = datetime.now()
+            self.is_stale = False
+            # 中继格式带有 stale / fetched_at：上游不可用时按离线数据显示，更新时间取中继最后一次成功拉取的时间
+            self.upstream_stale = bool(data and data.get('stale'))
+            if self.upstream_stale:
+                self.is_stale = True
+                self.last_error = self.RELAY_STALE_MESSAGE
+                if data.get('fetched_at'):
+                    self.last_updated = datetime.fromisoformat(data['fetched_at'])
+            if self.cache:
+                self.cache.save(self.games, self.etag, self.last_modified, self.last_updated)
+            if self.history:
+                self.history.record(self.last_diff, self.last_updated)
             return True, self.games
             
         except requests.RequestException as e:
-            return False, f"获取NBA数据失败: {str(e)}"
+            return self._serve_stale(f"获取NBA数据失败: {str(e)}")
         except Exception as e:
-            return False, f"解析NBA数据失败: {str(e)}"
+            return self._serve_stale(f"解析NBA数据失败: {str(e)}")
+    
+    def _parse_payload(self, data):
+        parsed_games = []
+        if 'scoreboard' in data:
+            games = data['scoreboard'].get('games', [])
+            parse = self._parse_game
+        else:
+            # 中继服务的精简格式：已是 Game.to_dict() 结构
+            games = data.get('games', [])
+            parse = self._parse_relay_game
+        
+        for game in games:
+            game_info = parse(game)
+            if game_info:
+                parsed_games.append(game_info)
+        return parsed_games
     
     def _parse_game(self, game):
         try:
-            home_team = game.get('homeTeam', {})
-            away_team = game.get('awayTeam', {})
-            game_status = game.get('gameStatus', 0)
-            game_status_text = game.get('gameStatusText', '')
-            game_time = game.get('gameTimeUTC', '')
-            
-            game_info = {
-                'game_id': game.get('gameId', ''),
-                'game_code': game.get('gameCode', ''),
-                'game_status': game_status,
-                'game_status_text': game_status_text,
-                'game_time': game_time,
-                'is_live': game_status == 2,
-                'is_finished': game_status == 3,
-                'home_team': {
-                    'team_id': home_team.get('teamId', ''),
-                    'team_name': home_team.get('teamName', ''),
-                    'team_city': home_team.get('teamCity', ''),
-                    'team_tricode': home_team.get('teamTricode', ''),
-                    'score': home_team.get('score', 0),
-                    'wins': home_team.get('wins', 0),
-                    'losses': home_team.get('losses', 0)
-                },
-                'away_team': {
-                    'team_id': away_team.get('teamId', ''),
-                    'team_name': away_team.get('teamName', ''),
-                    'team_city': away_team.get('teamCity', ''),
-                    'team_tricode': away_team.get('teamTricode', ''),
-                    'score': away_team.get('score', 0),
-                    'wins': away_team.get('wins', 0),
-                    'losses': away_team.get('losses', 0)
-                }
-            }
+            return Game.from_feed(game)
             
-            return game_info
+        except Exception as e:
+            print(f"解析比赛数据失败: {e}")
+            return None
+    
+    def _parse_relay_game(self, game):
+        try:
+            return Game.from_dict(game)
             
         except Exception as e:
             print(f"解析比赛数据失败: {e}")
             return None
     
+    def load_snapshot(self, snapshot=None):
+        # 从磁盘缓存恢复上次的比赛数据与校验值，标记为过期直到网络刷新成功；
+        # 调用方已读取过缓存时可直接传入，避免重复读盘
+        if snapshot is None and self.cache:
+            snapshot = self.cache.load()
+        if snapshot is None:
+            return False
+        
+        self.games, self.etag, self.last_modified, self.last_updated = snapshot
+        self.is_stale = True
+        return True
+    
     def get_games_by_status(self, status='all'):
         if status == 'live':
-            return [game for game in self.games if game['is_live']]
+            return [game for game in self.games if game.is_live]
         elif status == 'finished':
-            return [game for game in self.games if game['is_finished']]
+            return [game for game in self.games if game.is_finished]
         else:
             return self.games
     
@@ -86,7 +356,14 @@ class NBAApi:
         return len(self.games)
     
     def get_live_games_count(self):
-        return len([game for game in self.games if game['is_live']])
+        return len([game for game in self.games if game.is_live])
     
     def get_finished_games_count(self):
-        return len([game for game in self.games if game['is_finished']])
+        return len([game for game in self.games if game.is_finished])
+    
+    def get_response_counts(self):
+        return dict(self.response_counts)
+    
+    def close(self):
+        if self.owns_session:
+            self.session.close()
@@ -0,0 +1,255 @@
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+from game_model import LEAGUES
+
+# 无界面命令行入口：复用 NBAApi，不导入 PyQt5，适合服务器与终端环境。
+#   python nba_cli.py once [--json]
+#   python nba_cli.py watch [--json] [--interval 秒]
+#   python nba_cli.py --leagues nba,wnba once    同时拉取多个联赛
+#   python nba_cli.py history [比赛编号] [--since 日期]  查询面板记录的比分历史
+# 网络相关模块在子命令执行时才导入，保证 --help 等即时返回。
+
+
+def format_game(game):
+    away = game.away_team
+    home = game.home_team
+    line = (f"{away.team_tricode:>3} {away.score:>3} - {home.score:<3} {home.team_tricode:<3}  "
+            f"{game.game_status_text}")
+    if game.league_id != '00':
+        line = f"[{LEAGUES.get(game.league_id, game.league_id)}] {line}"
+    return line
+
+
+def make_api(args):
+    from league_group import create_api, parse_leagues
+
+    return create_api(parse_leagues(args.leagues), base_url=args.url)
+
+
+def emit_json(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    sys.stdout.flush()
+
+
+def emit_snapshot(api, as_json):
+    if as_json:
+        emit_json({
+            'type': 'snapshot',
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'stale': api.is_stale,
+            'games': [game.to_dict() for game in api.games]
+        })
+        return
+
+    if not api.games:
+        print("今日暂无比赛")
+    for game in api.games:
+        print(format_game(game))
+    sys.stdout.flush()
+
+
+def emit_diff(api, diff, as_json):
+    ts = datetime.now().isoformat(timespec='seconds')
+    for game_id in diff.removed:
+        if as_json:
+            emit_json({'type': 'removed', 'ts': ts, 'game_id': game_id})
+        else:
+            print(f"[{ts}] 移除 {game_id}")
+
+    for game_id in diff.changed_ids():
+        game = diff.games[game_id]
+        if as_json:
+            emit_json({
+                'type': 'added' if game_id in diff.added else 'updated',
+                'ts': ts,
+                'score_changed': game_id in diff.score_changed,
+                'status_changed': game_id in diff.status_changed,
+                'game': game.to_dict()
+            })
+        else:
+            print(f"[{ts}] {format_game(game)}")
+    sys.stdout.flush()
+
+
+def report_error(message, as_json):
+    if as_json:
+        emit_json({'type': 'error', 'ts': datetime.now().isoformat(timespec='seconds'), 'message': message})
+    else:
+        print(message, file=sys.stderr)
+
+
+def cmd_once(args):
+    api = make_api(args)
+    try:
+        success, result = api.fetch_games()
+    finally:
+        api.close()
+    if not success:
+        report_error(result, args.json)
+        return 1
+    emit_snapshot(api, args.json)
+    return 0
+
+
+def cmd_watch(args):
+    from poll_scheduler import PollScheduler
+
+    api = make_api(args)
+    history = None
+    if args.history:
+        from score_history import ScoreHistory
+        history = ScoreHistory()
+        api.history = history
+    scheduler = PollScheduler()
+    first = True
+
+    try:
+        while True:
+            success, result = api.fetch_games()
+            if getattr(api, 'league_errors', None):
+                # 个别联赛失败：报告原因，其余联赛的变化照常输出
+                report_error(api.league_errors, args.json)
+            if not success or api.last_error:
+                report_error(result if not success else api.last_error, args.json)
+            elif first:
+                emit_snapshot(api, args.json)
+                first = False
+            elif not api.last_diff.is_empty():
+                emit_diff(api, api.last_diff, args.json)
+
+            if args.interval:
+                interval = args.interval
+            elif success and not api.last_error:
+                interval = scheduler.next_interval(api.games)
+            else:
+                interval = scheduler.ERROR_INTERVAL
+            time.sleep(max(interval, api.breaker.retry_after()))
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        api.close()
+        if history:
+            history.close()
+
+
+def format_clock(seconds):
+    if seconds is None:
+        return '--:--'
+    return f"{int(seconds) // 60:02d}:{int(seconds) % 60:02d}"
+
+
+def cmd_history(args):
+    from score_history import ScoreHistory
+
+    history = ScoreHistory(args.db)
+    start = datetime.combine(args.since, datetime.min.time()) if args.since else None
+    end = datetime.combine(args.until, datetime.max.time()) if args.until else None
+    try:
+        if args.game_id:
+            points = history.query(args.game_id, start, end)
+        else:
+            games = history.games_between(start, end)
+    finally:
+        history.close()
+
+    if not args.game_id:
+        for game in games:
+            if args.json:
+                emit_json({'type': 'game', **game, 'first_ts': game['first_ts'].isoformat(),
+                           'last_ts': game['last_ts'].isoformat()})
+            else:
+                print(f"{game['game_id']}  {game['away_tricode']:>3} @ {game['home_tricode']:<3}  "
+                      f"{game['first_ts']:%Y-%m-%d %H:%M}{'  已结束' if game['final'] else ''}")
+        return 0
+
+    if not points:
+        report_error(f"没有比赛 {args.game_id} 的记录", args.json)
+        return 1
+    for point in points:
+        if args.json:
+            emit_json({'type': 'point', 'game_id': args.game_id, **point, 'ts': point['ts'].isoformat()})
+        else:
+            print(f"{point['ts']:%H:%M:%S}  Q{point['period']} {format_clock(point['clock_seconds'])}  "
+                  f"{point['away_score']:>3} - {point['home_score']:<3}")
+    return 0
+
+
+def cmd_range(args):
+    from nba_api import NBAApi
+    from snapshot_cache import DayCache
+
+    api = NBAApi()
+    api.day_cache = DayCache()
+    try:
+        success, result = api.fetch_range(args.start, args.end, args.workers)
+    finally:
+        api.close()
+    if not success:
+        report_error(result, args.json)
+        return 1
+
+    for day, games in result.items():
+        if args.json:
+            emit_json({'type': 'day', 'date': day.isoformat(), 'games': [game.to_dict() for game in games]})
+        else:
+            print(f"== {day.isoformat()} ({len(games)} 场)")
+            for game in games:
+                print(format_game(game))
+    for message in api.last_range_errors.values():
+        report_error(message, args.json)
+    return 0
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='nba_cli', description='NBA 实时比分 (命令行版)')
+    parser.add_argument('--url', default=None, help='数据地址，可指向中继服务的 /scoreboard')
+    parser.add_argument('--leagues', default=None, help='关注的联赛，如 nba,wnba,gleague (默认 nba，range 只支持 NBA)')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    once = subparsers.add_parser('once', help='拉取一次并输出今日比分')
+    once.add_argument('--json', action='store_true', help='输出 JSON')
+    once.set_defaults(func=cmd_once)
+
+    watch = subparsers.add_parser('watch', help='持续轮询并输出变化')
+    watch.add_argument('--json', action='store_true', help='以 JSON Lines 输出每次变化')
+    watch.add_argument('--interval', type=float, default=None, help='固定轮询间隔 (秒)，默认自适应')
+    watch.add_argument('--history', action='store_true', help='同时把比分变化记录到比分历史')
+    watch.set_defaults(func=cmd_watch)
+
+    history_parser = subparsers.add_parser('history', help='查询记录的比分历史 (不指定比赛时列出有记录的比赛)')
+    history_parser.add_argument('game_id', nargs='?', default=None, help='比赛编号')
+    history_parser.add_argument('--since', type=parse_date, default=None, help='开始日期 YYYY-MM-DD')
+    history_parser.add_argument('--until', type=parse_date, default=None, help='结束日期 YYYY-MM-DD')
+    history_parser.add_argument('--db', default=None, help='历史数据库路径，默认与面板相同')
+    history_parser.add_argument('--json', action='store_true', help='以 JSON Lines 输出')
+    history_parser.set_defaults(func=cmd_history)
+
+    range_parser = subparsers.add_parser('range', help='拉取一段日期内的历史比分 (已完赛日期永久缓存)')
+    range_parser.add_argument('start', type=parse_date, help='开始日期 YYYY-MM-DD')
+    range_parser.add_argument('end', type=parse_date, help='结束日期 YYYY-MM-DD')
+    range_parser.add_argument('--workers', type=int, default=None, help='并发请求数')
+    range_parser.add_argument('--json', action='store_true', help='以 JSON Lines 输出')
+    range_parser.set_defaults(func=cmd_range)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
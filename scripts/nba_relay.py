@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from league_group import create_api, parse_leagues
+from poll_scheduler import PollScheduler
+
+# 本地中继服务：只由一个轮询线程访问上游 CDN，最新快照与变更流分发给任意多个客户端，
+# 上游请求数从 O(客户端数) 降为 O(1)。
+#   GET /scoreboard              最新快照 (支持 If-None-Match -> 304)
+#   GET /scoreboard?wait=25      长轮询：带 If-None-Match 时阻塞到数据变化或超时
+#   GET /events                  SSE 推送：snapshot / update 事件
+# 面板设置环境变量 NBA_SCORES_RELAY=http://主机:端口 即改为从中继获取数据。
+# --leagues nba,wnba,gleague 时中继并发轮询多个联赛，快照中包含所有联赛的比赛。
+
+MAX_WAIT = 55
+STARTUP_RETRY_AFTER = 2 # 首次拉取完成前返回 503，建议客户端的重试间隔 (秒)
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class RelayState:
+    def __init__(self, history=256):
+        self.cond = threading.Condition()
+        self.version = 0
+        self.body = None # 首次 publish 之前没有可提供的快照 (/scoreboard 返回 503)
+        # 版本号每次启动都从 0 开始，ETag 带上进程随机标识，客户端保存的旧 ETag 在中继重启后不会误中 304
+        self.instance = os.urandom(4).hex()
+        self.etag = f'"{self.instance}-0"'
+        # SSE 事件历史：(version, 预序列化的事件)，落后太多的客户端改发完整快照
+        self.events = deque(maxlen=history)
+
+    def publish(self, api, diff, full):
+        fetched_at = api.last_updated.isoformat(timespec='seconds') if api.last_updated else None
+        games = [game.to_dict() for game in api.games]
+
+        with self.cond:
+            self.version += 1
+            # 每个版本只序列化一次，所有客户端共享同一份字节
+            self.body = _dumps({
+                'version': self.version,
+                'fetched_at': fetched_at,
+                'stale': api.is_stale,
+                'games': games
+            })
+            self.etag = f'"{self.instance}-{self.version}"'
+
+            if full:
+                event = self._sse('snapshot', self.body)
+            else:
+                changed = [diff.games[game_id].to_dict() for game_id in diff.changed_ids()]
+                event = self._sse('update', _dumps({
+                    'version': self.version,
+                    'fetched_at': fetched_at,
+                    'games': changed,
+                    'removed': diff.removed
+                }))
+            self.events.append((self.version, event))
+            self.cond.notify_all()
+
+    @staticmethod
+    def _sse(name, payload):
+        return b'event: ' + name.encode() + b'\ndata: ' + payload + b'\n\n'
+
+    def snapshot_event(self):
+        return self.version, self._sse('snapshot', self.body)
+
+    def wait_for_change(self, version, timeout):
+        with self.cond:
+            self.cond.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def events_since(self, version):
+        # 返回 version 之后的事件；历史不足时返回 None，调用方应改发快照
+        with self.cond:
+            if not self.events or self.events[0][0] > version + 1:
+                return None
+            return [(event_version, event) for event_version, event in self.events if event_version > version]
+
+
+class RelayPoller(threading.Thread):
+    def __init__(self, api, state, scheduler=None):
+        super().__init__(daemon=True)
+        self.api = api
+        self.state = state
+        self.scheduler = scheduler or PollScheduler()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        first = True
+        was_stale = False
+        while not self.stop_event.is_set():
+            success, result = self.api.fetch_games()
+            if success:
+                diff = self.api.last_diff
+                if first or not diff.is_empty() or self.api.is_stale != was_stale:
+                    self.state.publish(self.api, diff, full=first)
+                    first = False
+                was_stale = self.api.is_stale
+                interval = self.scheduler.next_interval(self.api.games)
+                if getattr(self.api, 'league_errors', None):
+                    print(f"[{datetime.now():%H:%M:%S}] {self.api.league_errors}", file=sys.stderr)
+            else:
+                print(f"[{datetime.now():%H:%M:%S}] {result}", file=sys.stderr)
+                interval = self.scheduler.ERROR_INTERVAL
+            if self.api.last_error:
+                interval = self.scheduler.ERROR_INTERVAL
+            self.stop_event.wait(max(interval, self.api.breaker.retry_after()))
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class RelayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # 头部与正文分开写出，关闭 Nagle 避免 keep-alive 下 40ms 的延迟确认等待
+    disable_nagle_algorithm = True
+    state = None # 由 make_server 绑定
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/scoreboard':
+            self.handle_scoreboard(parse_qs(url.query))
+        elif url.path == '/events':
+            self.handle_events()
+        else:
+            self.send_error(404)
+
+    def handle_scoreboard(self, query):
+        state = self.state
+        client_etag = self.headers.get('If-None-Match')
+
+        try:
+            wait = min(float(query.get('wait', ['0'])[0]), MAX_WAIT)
+        except ValueError:
+            wait = 0
+
+        with state.cond:
+            version, body, etag = state.version, state.body, state.etag
+        if version == 0:
+            # 尚未从上游拿到过数据 (刚启动或上游一直不可用)：不返回空记分板，避免客户端当作今日无比赛
+            self.send_response(503)
+            self.send_header('Retry-After', str(STARTUP_RETRY_AFTER))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if client_etag == etag and wait > 0:
+            # 长轮询：客户端已有最新数据，挂起直到有新版本或超时
+            state.wait_for_change(version, wait)
+            with state.cond:
+                body, etag = state.body, state.etag
+
+        if client_etag == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_events(self):
+        state = self.state
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            # 首次拉取完成前不推送空快照，之后的第一个事件即完整快照
+            version = 0
+            if state.version:
+                version, event = state.snapshot_event()
+                self.wfile.write(event)
+                self.wfile.flush()
+            while True:
+                new_version = state.wait_for_change(version, 15)
+                if new_version == version:
+                    # 心跳注释行，避免中间设备断开空闲连接
+                    self.wfile.write(b': keep-alive\n\n')
+                else:
+                    events = state.events_since(version)
+                    if events is None:
+                        events = [state.snapshot_event()]
+                    for version, event in events:
+                        self.wfile.write(event)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def make_server(host, port, state):
+    handler = type('BoundRelayHandler', (RelayHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='nba_relay', description='NBA 实时比分本地中继服务')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--upstream', default=None, help='上游地址，默认 NBA 官方 CDN')
+    parser.add_argument('--leagues', default=None, help='关注的联赛，如 nba,wnba,gleague (默认 nba)')
+    parser.add_argument('--history', default=None, metavar='PATH', help='把比分变化记录到该 SQLite 文件')
+    args = parser.parse_args(argv)
+
+    state = RelayState()
+    api = create_api(parse_leagues(args.leagues), base_url=args.upstream)
+    history = None
+    if args.history:
+        from score_history import ScoreHistory
+        history = ScoreHistory(args.history)
+        api.history = history
+    poller = RelayPoller(api, state)
+    poller.start()
+
+    server = make_server(args.host, args.port, state)
+    print(f"中继服务已启动: http://{args.host}:{args.port}/scoreboard")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.stop()
+        server.server_close()
+        api.close()
+        if history:
+            history.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,31 @@
 import sys
 import os
+import time
 import ctypes # 引入 ctypes
+
+# 启动计时起点：在导入 PyQt 之前记录，用于统计首屏绘制耗时
+STARTUP_CLOCK = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QLabel, QPushButton, QScrollArea, 
-                             QFrame, QDesktopWidget, QSystemTrayIcon, QMenu, QAction,
-                             QGraphicsDropShadowEffect, QGraphicsBlurEffect, QSizePolicy)
-from PyQt5.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve, QRect
-from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QLinearGradient, QBrush, QPixmap, QPainter, QPainterPath, QPen
-from nba_api import NBAApi
+                             QHBoxLayout, QLabel, QPushButton, 
+                             QFrame, QSystemTrayIcon, QMenu, QAction,
+                             QSizePolicy, QShortcut,
+                             QListView, QStyledItemDelegate, QStyle, QAbstractItemView)
+from PyQt5.QtCore import (Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve, QRect, QRectF, QSize,
+                          QAbstractListModel, QModelIndex)
+from PyQt5.QtGui import (QFont, QColor, QPalette, QLinearGradient, QPainter, QPen,
+                         QKeySequence, QFontMetrics)
+from fetch_worker import FetchEngine
+from poll_scheduler import PollScheduler
+from snapshot_cache import SnapshotCache
+from game_events import GameEventEngine, TIPOFF, CLOSE_GAME, OVERTIME, FINAL
+from scoreboard_diff import diff_games
+from metrics import metrics_from_env
+from icon_renderer import IconRenderer, badge_text
+from theme import load_theme
+from edge_dock import EdgeDock
+from shadow import ShadowPainter
+from game_model import LEAGUES
 from datetime import datetime
 
 # NBA 球队中英文对照表
@@ -20,193 +38,299 @@ NBA_TEAMS_CN = {
     'SAC': '国王', 'SAS': '马刺', 'TOR': '猛龙', 'UTA': '爵士', 'WAS': '奇才'
 }
 
-class GameWidget(QFrame):
-    def __init__(self, game_data):
-        super().__init__()
-        self.game_data = game_data
-        self.setup_ui()
-        self.setup_animation()
+# WNBA 球队中英文对照表 (缩写与 NBA 有重复，需按联赛区分)
+WNBA_TEAMS_CN = {
+    'ATL': '梦想', 'CHI': '天空', 'CON': '太阳', 'DAL': '飞翼', 'GSV': '女武神',
+    'IND': '狂热', 'LVA': '王牌', 'LAS': '火花', 'MIN': '山猫', 'NYL': '自由人',
+    'PHX': '水星', 'SEA': '风暴', 'WAS': '神秘人'
+}
+
+TEAMS_CN = {'00': NBA_TEAMS_CN, '10': WNBA_TEAMS_CN}
+
+# 默认通知的事件类型 (领先易主过于频繁，不做弹窗)
+NOTIFY_EVENTS = (TIPOFF, CLOSE_GAME, OVERTIME, FINAL)
+
+def team_name_cn(team, league_id='00'):
+    name = TEAMS_CN.get(league_id, {}).get(team.team_tricode)
+    if name:
+        return name
+    # 没有中文译名的球队 (如 G League) 显示英文队名
+    return team.team_tricode if league_id == '00' else (team.team_name or team.team_tricode)
+
+def format_event_message(event):
+    game = event.game
+    away_name = team_name_cn(game.away_team, game.league_id)
+    home_name = team_name_cn(game.home_team, game.league_id)
+    score_line = f"{away_name} {game.away_team.score} vs {home_name} {game.home_team.score}"
+    if game.league_id != '00':
+        score_line = f"[{LEAGUES.get(game.league_id, game.league_id)}] {score_line}"
+    if event.type == FINAL:
+        return f"比赛结束：{score_line}"
+    elif event.type == TIPOFF:
+        return f"比赛开始：{away_name} vs {home_name}"
+    elif event.type == OVERTIME:
+        overtime = game.period - 4
+        return f"进入{'加时' if overtime == 1 else f'第{overtime}个加时'}：{score_line}"
+    elif event.type == CLOSE_GAME:
+        return f"{'加时' if game.period > 4 else '第四节'}胶着：{score_line}"
+    return f"领先易主：{score_line}"
+
+def format_status_text(status_text):
+    # 状态文字汉化处理
+    if "Final" in status_text: 
+        return "已结束"
+    elif "pm" in status_text.lower():
+        time_str = status_text.lower().replace(" et", "").replace("pm", "").strip()
+        return f"比赛时间 {time_str}"
+    elif "am" in status_text.lower():
+        time_str = status_text.lower().replace(" et", "").replace("am", "").strip()
+        return f"比赛时间 {time_str}"
+    return status_text
+
+def game_state(game_data):
+    if game_data.is_live:
+        return 'live'
+    elif game_data.is_finished:
+        return 'finished'
+    return 'scheduled'
+
+class LeagueHeader:
+    # 联赛分组标题行 (同时有多个联赛的比赛时插入)；game_id 作为模型中的行键，不会与比赛编号冲突
+    __slots__ = ('game_id', 'league_id', 'title')
     
-    def setup_ui(self):
-        self.setFrameStyle(QFrame.NoFrame)
-        
-        # 极简深色玻璃风格配色
-        if self.game_data['is_live']:
-            # 进行中：深邃黑底 + 霓虹绿光晕
-            self.bg_color = "rgba(30, 41, 59, 0.7)"
-            self.border_color = "rgba(74, 222, 128, 0.3)"
-            self.text_primary = "#ffffff"
-            self.text_secondary = "#94a3b8"
-            self.accent_color = "#4ade80" # 亮绿
-            self.status_bg = "rgba(74, 222, 128, 0.15)"
-        elif self.game_data['is_finished']:
-            # 已结束：低调深灰
-            self.bg_color = "rgba(30, 41, 59, 0.4)"
-            self.border_color = "rgba(255, 255, 255, 0.05)"
-            self.text_primary = "#cbd5e1"
-            self.text_secondary = "#64748b"
-            self.accent_color = "#94a3b8"
-            self.status_bg = "rgba(148, 163, 184, 0.1)"
+    def __init__(self, league_id, count):
+        self.game_id = f"league:{league_id}"
+        self.league_id = league_id
+        self.title = f"{LEAGUES.get(league_id, league_id)} · {count} 场"
+
+class GameListModel(QAbstractListModel):
+    # 比赛列表模型：刷新时只对发生变化的行发出 dataChanged，视图据此只重绘可见的受影响行。
+    # 行可以是比赛 (Game) 或联赛标题 (LeagueHeader)
+    GameRole = Qt.UserRole + 1
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.games = []
+        self.rows = {} # game_id -> 行号
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.games)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        game = self.games[index.row()]
+        if role == self.GameRole:
+            return game
+        if role == Qt.DisplayRole:
+            # 供辅助功能与调试使用，界面由委托绘制
+            if isinstance(game, LeagueHeader):
+                return game.title
+            return (f"{team_name_cn(game.away_team, game.league_id)} {game.away_team.score} : "
+                    f"{game.home_team.score} {team_name_cn(game.home_team, game.league_id)}")
+        return None
+    
+    def set_games(self, games, changed=None):
+        # changed 为本次有变化的 game_id，None 表示全部；返回通知视图更新的行数
+        old_ids = [game.game_id for game in self.games]
+        new_ids = [game.game_id for game in games]
+        
+        if new_ids != old_ids:
+            if set(new_ids) == set(old_ids):
+                # 只是顺序变化 (如比赛开始后移到前面)：不重建模型，只通知布局变化
+                self.layoutAboutToBeChanged.emit()
+                self.games = list(games)
+                self.rows = {game_id: row for row, game_id in enumerate(new_ids)}
+                self.layoutChanged.emit()
+            else:
+                self.beginResetModel()
+                self.games = list(games)
+                self.rows = {game_id: row for row, game_id in enumerate(new_ids)}
+                self.endResetModel()
+            return len(games)
+        
+        self.games = list(games)
+        if changed is None:
+            rows = list(range(len(games)))
         else:
-            # 未开始：温暖琥珀
-            self.bg_color = "rgba(30, 41, 59, 0.7)"
-            self.border_color = "rgba(251, 191, 36, 0.2)"
-            self.text_primary = "#ffffff"
-            self.text_secondary = "#94a3b8"
-            self.accent_color = "#fbbf24" # 琥珀色
-            self.status_bg = "rgba(251, 191, 36, 0.15)"
-        
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {self.bg_color};
-                border: 1px solid {self.border_color};
-                border-radius: 12px;
-            }}
-            QFrame:hover {{
-                background-color: rgba(51, 65, 85, 0.8);
-                border: 1px solid {self.accent_color};
-            }}
-        """)
-        
-        # 主布局 - 紧凑型
-        main_layout = QVBoxLayout()
-        main_layout.setSpacing(0)
-        main_layout.setContentsMargins(16, 12, 16, 12)
-        
-        # 1. 顶部信息栏 (状态 | 时间)
-        info_layout = QHBoxLayout()
-        info_layout.setContentsMargins(0, 0, 0, 8)
-        
-        # 状态指示 (胶囊) - 汉化处理
-        status_text = self.game_data['game_status_text']
-        if "Final" in status_text: 
-            status_text = "已结束"
-        elif "pm" in status_text.lower():
-            time_str = status_text.lower().replace(" et", "").replace("pm", "").strip()
-            status_text = f"比赛时间 {time_str}"
-        elif "am" in status_text.lower():
-            time_str = status_text.lower().replace(" et", "").replace("am", "").strip()
-            status_text = f"比赛时间 {time_str}"
-        
-        status_label = QLabel(status_text)
-        status_label.setFont(QFont("Microsoft YaHei UI", 9, QFont.Bold))
-        status_label.setStyleSheet(f"""
-            color: {self.accent_color}; 
-            background-color: {self.status_bg}; 
-            border-radius: 4px; 
-            padding: 2px 8px;
-            border: none;
-        """)
-        status_label.setFixedHeight(22)
-        
-        info_layout.addWidget(status_label)
-        info_layout.addStretch()
-        
-        # 2. 比赛数据网格 (客队 - 比分 - 主队)
-        game_grid = QHBoxLayout()
-        game_grid.setSpacing(0)
-        
-        # 左侧：客队 (Logo/Code + Name)
-        away_widget = self.create_team_info(self.game_data['away_team'], Qt.AlignLeft)
-        
-        # 中间：比分
-        score_widget = QWidget()
-        score_widget.setStyleSheet("background: transparent; border: none;")
-        score_layout = QHBoxLayout(score_widget)
-        score_layout.setContentsMargins(10, 0, 10, 0)
-        score_layout.setSpacing(12)
-        
-        score_font = QFont("Segoe UI", 20, QFont.Bold)
-        score_font.setLetterSpacing(QFont.AbsoluteSpacing, 1)
-        
-        away_score = QLabel(str(self.game_data['away_team']['score']))
-        away_score.setFont(score_font)
-        away_score.setStyleSheet(f"color: {self.text_primary}; border: none;")
-        
-        divider = QLabel(":")
-        divider.setFont(QFont("Segoe UI", 16))
-        divider.setStyleSheet(f"color: {self.text_secondary}; margin-bottom: 2px; border: none;")
-        
-        home_score = QLabel(str(self.game_data['home_team']['score']))
-        home_score.setFont(score_font)
-        home_score.setStyleSheet(f"color: {self.text_primary}; border: none;")
-        
-        score_layout.addWidget(away_score)
-        score_layout.addWidget(divider)
-        score_layout.addWidget(home_score)
-        
-        # 右侧：主队
-        home_widget = self.create_team_info(self.game_data['home_team'], Qt.AlignRight)
-        
-        game_grid.addWidget(away_widget, 1)
-        game_grid.addWidget(score_widget, 0)
-        game_grid.addWidget(home_widget, 1)
-        
-        main_layout.addLayout(info_layout)
-        main_layout.addLayout(game_grid)
-        
-        self.setLayout(main_layout)
-        self.setMinimumHeight(100)
-        self.setMaximumHeight(100)
+            rows = sorted(self.rows[game_id] for game_id in changed if game_id in self.rows)
+        
+        # 相邻的行合并为一次 dataChanged
+        start = None
+        for position, row in enumerate(rows):
+            if start is None:
+                start = row
+            if position + 1 == len(rows) or rows[position + 1] != row + 1:
+                self.dataChanged.emit(self.index(start), self.index(row), [self.GameRole, Qt.DisplayRole])
+                start = None
+        return len(rows)
 
-    def create_team_info(self, team_data, align):
-        widget = QWidget()
-        widget.setStyleSheet("background: transparent; border: none;")
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(2)
-        
-        # 汉化球队名称
-        tricode = team_data['team_tricode']
-        team_name_cn = NBA_TEAMS_CN.get(tricode, tricode)
-        
-        # 球队名
-        name_label = QLabel(team_name_cn)
-        name_label.setFont(QFont("Microsoft YaHei UI", 14, QFont.Bold))
-        name_label.setStyleSheet(f"color: {self.text_primary};")
-        name_label.setAlignment(align)
-        
-        # 英文缩写 (辅助显示)
-        code_label = QLabel(tricode) 
-        code_label.setFont(QFont("Segoe UI", 8))
-        code_label.setStyleSheet(f"color: {self.text_secondary};")
-        code_label.setAlignment(align)
-        
-        layout.addWidget(name_label)
-        layout.addWidget(code_label)
-        layout.addStretch()
-        
-        return widget
+class GameCardDelegate(QStyledItemDelegate):
+    # 比赛卡片委托：按主题直接绘制 (状态胶囊 | 客队 - 比分 - 主队)，每行不再持有控件
+    CARD_HEIGHT = 100
+    CARD_SPACING = 8 # 卡片间距
+    HEADER_HEIGHT = 30 # 联赛标题行
+    MARGIN_X = 12
+    PADDING_X = 16
+    PADDING_Y = 12
+    PILL_HEIGHT = 22
+    PILL_PADDING = 12 # 胶囊左右内边距
+    SCORE_GAP = 18   # 比分与冒号的间距
     
-    def setup_animation(self):
-        self.color_animation = QPropertyAnimation(self, b"styleSheet")
-        self.color_animation.setDuration(200)
-        self.color_animation.setEasingCurve(QEasingCurve.OutQuad)
+    def __init__(self, theme, parent=None):
+        super().__init__(parent)
+        self.theme = theme
+        self.metrics = {} # 字体角色 -> QFontMetrics
+    
+    def font_metrics(self, role):
+        metrics = self.metrics.get(role)
+        if metrics is None:
+            metrics = QFontMetrics(self.theme.font(role))
+            self.metrics[role] = metrics
+        return metrics
+    
+    def sizeHint(self, option, index):
+        if isinstance(index.data(GameListModel.GameRole), LeagueHeader):
+            return QSize(option.rect.width(), self.HEADER_HEIGHT)
+        return QSize(option.rect.width(), self.CARD_HEIGHT + self.CARD_SPACING)
+    
+    def paint(self, painter, option, index):
+        game = index.data(GameListModel.GameRole)
+        if game is None:
+            return
+        if isinstance(game, LeagueHeader):
+            self.paint_header(painter, option.rect, game)
+            return
+        colors = self.theme.colors(game_state(game))
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        
+        # 卡片背景 (悬停时高亮边框)
+        card = QRectF(option.rect.adjusted(self.MARGIN_X, 0, -self.MARGIN_X, -self.CARD_SPACING))
+        card.adjust(0.5, 0.5, -0.5, -0.5)
+        painter.setPen(QPen(colors['accent'] if hovered else colors['border'], 1))
+        painter.setBrush(colors['hover_bg'] if hovered else colors['bg'])
+        painter.drawRoundedRect(card, 12, 12)
+        
+        content = card.adjusted(self.PADDING_X, self.PADDING_Y, -self.PADDING_X, -self.PADDING_Y)
+        
+        # 1. 状态胶囊
+        status_text = format_status_text(game.game_status_text)
+        painter.setFont(self.theme.font('status'))
+        pill_width = self.font_metrics('status').horizontalAdvance(status_text) + self.PILL_PADDING * 2
+        pill = QRectF(content.left(), content.top(), pill_width, self.PILL_HEIGHT)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(colors['status_bg'])
+        painter.drawRoundedRect(pill, 4, 4)
+        painter.setPen(colors['accent'])
+        painter.drawText(pill, Qt.AlignCenter, status_text)
+        
+        # 2. 比赛数据 (客队 - 比分 - 主队)
+        grid = QRectF(content.left(), pill.bottom() + 8, content.width(), content.bottom() - pill.bottom() - 8)
+        self.paint_team(painter, grid, game.away_team, game.league_id, Qt.AlignLeft, colors)
+        self.paint_team(painter, grid, game.home_team, game.league_id, Qt.AlignRight, colors)
+        
+        away_text, home_text = str(game.away_team.score), str(game.home_team.score)
+        score_metrics = self.font_metrics('score')
+        away_width = score_metrics.horizontalAdvance(away_text)
+        home_width = score_metrics.horizontalAdvance(home_text)
+        divider_width = self.font_metrics('divider').horizontalAdvance(":")
+        left = grid.center().x() - (away_width + divider_width + home_width + self.SCORE_GAP * 2) / 2
+        
+        painter.setFont(self.theme.font('score'))
+        painter.setPen(colors['text_primary'])
+        painter.drawText(QRectF(left, grid.top(), away_width, grid.height()), Qt.AlignCenter, away_text)
+        painter.drawText(QRectF(left + away_width + divider_width + self.SCORE_GAP * 2, grid.top(), home_width, grid.height()),
+                         Qt.AlignCenter, home_text)
+        painter.setFont(self.theme.font('divider'))
+        painter.setPen(colors['text_secondary'])
+        painter.drawText(QRectF(left + away_width + self.SCORE_GAP, grid.top(), divider_width, grid.height() - 2),
+                         Qt.AlignCenter, ":")
+        
+        painter.restore()
+    
+    def paint_header(self, painter, rect, header):
+        # 联赛标题：小号次要文字，与卡片左边缘对齐
+        painter.save()
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self.theme.font('status'))
+        painter.setPen(self.theme.colors('finished')['text_secondary'])
+        painter.drawText(QRectF(rect.adjusted(self.MARGIN_X + 4, 0, -self.MARGIN_X, -4)),
+                         Qt.AlignLeft | Qt.AlignBottom, header.title)
+        painter.restore()
+    
+    def paint_team(self, painter, rect, team, league_id, align, colors):
+        # 球队中文名 + 英文缩写 (辅助显示)
+        name_height = self.font_metrics('team_name').height()
+        painter.setFont(self.theme.font('team_name'))
+        painter.setPen(colors['text_primary'])
+        painter.drawText(QRectF(rect.left(), rect.top(), rect.width(), name_height),
+                         align | Qt.AlignVCenter, team_name_cn(team, league_id))
+        painter.setFont(self.theme.font('team_code'))
+        painter.setPen(colors['text_secondary'])
+        painter.drawText(QRectF(rect.left(), rect.top() + name_height + 2, rect.width(),
+                                self.font_metrics('team_code').height()),
+                         align | Qt.AlignVCenter, team.team_tricode)
 
 class NBAScoresPanel(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.api = NBAApi()
+        # 性能指标 (NBA_SCORES_METRICS=1 开启)：日志行、调试浮层 (Ctrl+Shift+D) 与 /metrics 端点
+        self.metrics, self.metrics_server = metrics_from_env()
+        # 卡片主题：各状态配色与字体只生成一次 (NBA_SCORES_THEME 可指定用户主题)
+        self.theme = load_theme()
+        # 网络模块 (requests) 与托盘在首屏绘制之后才创建，见 finish_startup
+        self.api = None
+        self.fetcher = None
+        self.tray_icon = None
+        self.history = None
+        self.tray_badge_count = None
+        self.icons = IconRenderer() # 图标渲染缓存，窗口与托盘共用
+        self.startup_done = False
+        self.first_paint_ms = None
+        self.snapshot_cache = SnapshotCache()
+        self.snapshot = self.snapshot_cache.load()
         self.games = []
         self.is_hidden = False
         self.hidden_edge = None
-        self.edge_threshold = 30
         self.drag_position = None
-        self.screen_geometry = None # 缓存屏幕几何信息
+        # 贴边停靠：按面板所在屏幕计算，屏幕几何信息缓存到屏幕增减或分辨率变化为止
+        self.dock = EdgeDock(self, threshold=30)
         self.is_expanded = True # 默认展开状态
         self.expanded_height = 620 # 展开高度
         self.collapsed_height = 360 # 折叠高度 (增加高度以完全显示两个卡片)
         
-        self.notified_games = set() # 记录已通知结束的比赛ID
         self.first_load = True # 标记首次加载
         
-        self.setup_ui()
-        self.setup_system_tray()
-        self.load_games()
+        # 面板不可见 (托盘最小化 / 贴边隐藏) 时暂停渲染，变更集合并后在恢复显示时一次性应用
+        self.render_pending = False
+        self.pending_diff = None
+        
+        # 比赛事件通知：可通过 NBA_SCORES_TEAMS=LAL,BOS 只关注指定球队
+        teams = os.environ.get('NBA_SCORES_TEAMS')
+        self.event_engine = GameEventEngine(
+            teams={code.strip().upper() for code in teams.split(',') if code.strip()} if teams else None,
+            events=NOTIFY_EVENTS
+        )
         
+        # 自适应轮询：每次刷新完成后由调度器决定下一次刷新时间
+        self.scheduler = PollScheduler()
         self.refresh_timer = QTimer()
+        self.refresh_timer.setSingleShot(True)
         self.refresh_timer.timeout.connect(self.auto_refresh)
-        self.refresh_timer.start(30000)
+        
+        self.setup_ui()
+        
+        # 先渲染磁盘缓存中的上次数据，网络刷新在后台进行
+        if self.snapshot is not None:
+            self.games = self.snapshot[0]
+            self.update_ui()
+        
+        # 首屏绘制后立即完成剩余初始化；窗口未被绘制 (如启动即最小化) 时由兜底定时器触发
+        QTimer.singleShot(1000, self.finish_startup)
         
         self.hide_timer = QTimer()
         self.hide_timer.setSingleShot(True)
@@ -216,6 +340,57 @@ class NBAScoresPanel(QMainWindow):
         self.show_timer.setSingleShot(True)
         self.show_timer.timeout.connect(self.show_panel)
     
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        painter = QPainter(self)
+        container_rect = QRect(self.container.mapTo(self, QPoint(0, 0)), self.container.size())
+        self.shadow.paint(painter, container_rect, self.devicePixelRatioF())
+        painter.end()
+        
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - STARTUP_CLOCK) * 1000
+            if self.metrics.enabled:
+                self.metrics.gauge('startup_first_paint_ms', self.first_paint_ms)
+                print(f"[startup] 首屏绘制 {self.first_paint_ms:.1f}ms")
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        # 首屏之后的初始化：加载网络模块、发起首次刷新，再在请求进行期间创建图标与托盘
+        if self.startup_done:
+            return
+        self.startup_done = True
+        
+        from league_group import create_api, parse_leagues
+        # 设置 NBA_SCORES_RELAY 后改从本地中继服务获取数据，不再直连 CDN (关注哪些联赛由中继决定)；
+        # NBA_SCORES_LEAGUES=nba,wnba,gleague 同时关注多个联赛，共用一个调度器与连接池
+        relay = os.environ.get('NBA_SCORES_RELAY')
+        self.api = create_api(parse_leagues(os.environ.get('NBA_SCORES_LEAGUES')),
+                              base_url=f"{relay.rstrip('/')}/scoreboard" if relay else None,
+                              cache=self.snapshot_cache, metrics=self.metrics, long_poll=bool(relay))
+        if self.snapshot is not None:
+            self.api.load_snapshot(self.snapshot)
+            self.snapshot = None
+        
+        # 比分历史：在后台刷新线程中按变更集批量写入 SQLite (NBA_SCORES_HISTORY_DAYS 为保留天数，0 关闭)
+        history_days = os.environ.get('NBA_SCORES_HISTORY_DAYS', '')
+        if history_days != '0':
+            from score_history import ScoreHistory
+            self.history = ScoreHistory(retention_days=int(history_days) if history_days.isdigit() else None)
+            self.api.history = self.history
+        
+        # 后台拉取引擎，避免网络请求阻塞 GUI 线程
+        self.fetcher = FetchEngine(self.api, self)
+        self.fetcher.finished.connect(self.on_games_loaded)
+        self.load_games()
+        
+        QApplication.setWindowIcon(self.icons.icon())
+        self.setup_system_tray()
+        
+        if self.metrics.enabled:
+            startup_ms = (time.perf_counter() - STARTUP_CLOCK) * 1000
+            self.metrics.gauge('startup_ready_ms', startup_ms)
+            print(f"[startup] 初始化完成 {startup_ms:.1f}ms")
+    
     def setup_ui(self):
         self.setWindowTitle("NBA Tracker")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
@@ -240,11 +415,8 @@ class NBAScoresPanel(QMainWindow):
             }
         """)
         
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(40)
-        shadow.setColor(QColor(0, 0, 0, 180)) # 更深的阴影
-        shadow.setOffset(0, 10)
-        self.container.setGraphicsEffect(shadow)
+        # 阴影：预渲染的九宫格阴影，在 paintEvent 中绘制于容器之下 (更深的阴影)
+        self.shadow = ShadowPainter(blur_radius=40, color=QColor(0, 0, 0, 180), corner_radius=16)
         
         container_layout = QVBoxLayout()
         container_layout.setSpacing(0)
@@ -365,17 +537,35 @@ class NBAScoresPanel(QMainWindow):
         
         # 内容区
         content_widget = QWidget()
-        content_widget.setStyleSheet("background: transparent;")
+        # 透明背景只作用于容器本身，不层叠到子控件
+        content_widget.setObjectName("ContentArea")
+        content_widget.setStyleSheet("QWidget#ContentArea { background: transparent; }")
         content_layout = QVBoxLayout(content_widget)
         content_layout.setSpacing(0)
         content_layout.setContentsMargins(0, 0, 0, 10)
         
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea { border: none; background: transparent; }
+        # “暂无比赛”提示只创建一次，按需显示/隐藏
+        self.no_games_label = QLabel("今日暂无比赛")
+        self.no_games_label.setFont(QFont("Segoe UI", 15))
+        self.no_games_label.setAlignment(Qt.AlignCenter)
+        self.no_games_label.setStyleSheet("color: #8e8e93; padding: 50px;")
+        self.no_games_label.setVisible(False)
+        content_layout.addWidget(self.no_games_label)
+        
+        # 比赛列表：模型 + 绘制委托，只绘制可见行，行数多 (多日 / 多联赛) 时也不会为每场比赛创建控件
+        self.game_model = GameListModel(self)
+        self.game_list = QListView()
+        self.game_list.setModel(self.game_model)
+        self.game_list.setItemDelegate(GameCardDelegate(self.theme, self.game_list))
+        self.game_list.setUniformItemSizes(True)
+        self.game_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.game_list.setSelectionMode(QAbstractItemView.NoSelection)
+        self.game_list.setFocusPolicy(Qt.NoFocus)
+        self.game_list.setMouseTracking(True) # 悬停高亮
+        self.game_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.game_list.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.game_list.setStyleSheet("""
+            QListView { border: none; background: transparent; }
             QScrollBar:vertical {
                 border: none;
                 background: rgba(0, 0, 0, 0.1);
@@ -396,20 +586,24 @@ class NBAScoresPanel(QMainWindow):
             QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }
         """)
         
-        self.games_container = QWidget()
-        self.games_container.setStyleSheet("background: transparent;")
-        self.games_layout = QVBoxLayout(self.games_container)
-        self.games_layout.setSpacing(8) # 卡片间距
-        self.games_layout.setContentsMargins(12, 0, 12, 12)
-        self.games_layout.addStretch()
-        
-        self.scroll_area.setWidget(self.games_container)
-        content_layout.addWidget(self.scroll_area)
+        self.game_list.viewport().setAutoFillBackground(False)
+        content_layout.addWidget(self.game_list)
         
         container_layout.addWidget(title_bar)
         container_layout.addWidget(content_widget)
         container_layout.addWidget(stats_bar) # 统计栏放底部
         
+        # 调试浮层：显示上一次刷新的各阶段耗时，仅在开启性能指标时可用
+        self.debug_overlay = QLabel()
+        self.debug_overlay.setFont(QFont("Consolas", 8))
+        self.debug_overlay.setStyleSheet("color: #4ade80; background: rgba(0, 0, 0, 0.4); padding: 6px 16px;")
+        self.debug_overlay.setVisible(False)
+        container_layout.addWidget(self.debug_overlay)
+        if self.metrics.enabled:
+            self.debug_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+            self.debug_shortcut.activated.connect(
+                lambda: self.debug_overlay.setVisible(not self.debug_overlay.isVisible()))
+        
         self.container.setLayout(container_layout)
         main_layout.addWidget(self.container)
         
@@ -420,10 +614,7 @@ class NBAScoresPanel(QMainWindow):
         self.expand_button.setText("▼") # 显示展开图标
         self.setFixedSize(400, self.collapsed_height) # 默认折叠高度
         
-        screen = QDesktopWidget().screenGeometry()
-        x = screen.width() - 420
-        y = 100
-        self.move(x, y)
+        self.move(self.dock.initial_position(self.size()))
     
     def on_stats_bar_click(self, event):
         if event.button() == Qt.LeftButton:
@@ -474,58 +665,7 @@ class NBAScoresPanel(QMainWindow):
     
     def setup_system_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
-        
-        # 动态绘制图标
-        pixmap = QPixmap(64, 64)
-        pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # 1. 绘制背景圆 (使用路径数据中的灰色 #696065)
-        path1 = QPainterPath()
-        # SVG path 1: M198.692801 198.692801...
-        # 这是一个圆形背景，我们可以直接画一个圆，或者简化路径。
-        # 为了最佳效果，我们直接画一个圆，颜色取自 SVG 第一个 path 的 fill
-        painter.setBrush(QBrush(QColor("#696065")))
-        painter.setPen(Qt.NoPen)
-        # 原始 SVG viewBox 是 1024x1024，这里缩放到 64x64
-        # 1024 / 64 = 16
-        # 圆心大概在 512, 512，半径大概是 443 (根据 path 数据估算)
-        # 简单起见，我们画满整个 64x64
-        painter.drawEllipse(0, 0, 64, 64)
-        
-        # 2. 绘制奖杯图案 (黄色 #FBB01F)
-        # 由于 SVG path 比较复杂，手动转换很繁琐且易错。
-        # 我们用一个简化的奖杯形状来代替，或者尝试绘制核心部分。
-        # 这里为了稳定性和效率，我们绘制一个风格化的奖杯。
-        
-        painter.setBrush(QBrush(QColor("#FBB01F")))
-        
-        # 奖杯底座
-        painter.drawRect(20, 48, 24, 6)
-        painter.drawRect(26, 42, 12, 6)
-        
-        # 奖杯杯身 (倒梯形 + 半圆)
-        path_cup = QPainterPath()
-        path_cup.moveTo(16, 16)
-        path_cup.lineTo(48, 16)
-        path_cup.lineTo(40, 36)
-        path_cup.lineTo(24, 36)
-        path_cup.closeSubpath()
-        painter.drawPath(path_cup)
-        
-        # 奖杯把手 (左右圆弧)
-        painter.setBrush(Qt.NoBrush)
-        painter.setPen(QPen(QColor("#FBB01F"), 3))
-        painter.drawArc(12, 18, 10, 10, 90*16, 180*16)
-        painter.drawArc(42, 18, 10, 10, -90*16, 180*16)
-        
-        painter.end()
-        
-        icon = QIcon(pixmap)
-        self.tray_icon.setIcon(icon)
-        self.tray_icon.setToolTip("NBA实时比分")
+        self.update_tray_badge(sum(1 for game in self.games if game.is_live))
         
         menu = QMenu()
         # 设置菜单样式
@@ -586,84 +726,176 @@ class NBAScoresPanel(QMainWindow):
         # 3. 如果窗口处于边缘隐藏状态，执行滑出动画
         if self.is_hidden:
             self.show_panel()
+        
+        # 4. 应用隐藏期间累积的更新
+        self.flush_pending_render()
             
-        # 4. 激活窗口并置顶
+        # 5. 激活窗口并置顶
         self.activateWindow()
         self.raise_()
 
     def quit_app(self):
-        self.tray_icon.hide()
+        # 首屏之后才创建网络模块与托盘 (finish_startup)，启动完成前退出时它们可能还不存在
+        if self.tray_icon:
+            self.tray_icon.hide()
+        if self.fetcher:
+            self.fetcher.shutdown()
+        if self.api:
+            self.api.close()
+        if self.history:
+            self.history.close()
         QApplication.quit()
     
     def load_games(self):
-        success, result = self.api.fetch_games()
-        
+        # 异步拉取，结果由 on_games_loaded 处理；已有请求在途时会自动并入
+        self.fetcher.refresh()
+    
+    def schedule_next_refresh(self, success=True):
+        if success and not self.api.last_error:
+            # 中继长轮询：请求本身挂起到数据变化，返回后立即发起下一次
+            interval = 0 if getattr(self.api, 'long_poll', False) else self.scheduler.next_interval_ms(self.games)
+        else:
+            interval = self.scheduler.ERROR_INTERVAL * 1000
+        # 熔断期间暂停轮询，直到冷却结束
+        interval = max(interval, int(self.api.breaker.retry_after() * 1000))
+        self.refresh_timer.start(interval)
+    
+    def on_games_loaded(self, success, result):
         if success:
             self.games = result
-            self.update_ui()
-            self.check_finished_games() # 检查是否有新结束的比赛
+        self.schedule_next_refresh(success)
+        
+        if not success:
+            self.stats_label.setText(f"错误: {result}")
+        elif self.render_suspended():
+            # 界面不可见：只合并变更集，托盘角标与事件通知照常
+            diff = self.api.last_diff
+            if not diff.is_empty():
+                self.pending_diff = diff if self.pending_diff is None else self.pending_diff.merge(diff)
+            self.render_pending = True
+            self.metrics.count('renders_deferred')
+            self.update_tray_badge(sum(1 for game in self.games if game.is_live))
+            self.notify_events(diff)
             self.first_load = False
+        elif self.api.last_diff.is_empty() and not self.first_load:
+            # 304 或数据无变化，无需重建界面，只更新统计栏 (可能切换了离线状态)
+            self.update_stats()
         else:
-            self.stats_label.setText(f"错误: {result}")
+            diff = self.api.last_diff
+            with self.metrics.stage('update_ui'):
+                self.update_ui(diff)
+            self.notify_events(diff)
+            self.first_load = False
+        
+        if self.metrics.enabled:
+            self.metrics.end_refresh()
+            self.debug_overlay.setText(self.metrics.overlay_text())
 
-    def check_finished_games(self):
-        for game in self.games:
-            if game['is_finished']:
-                game_id = game['game_id']
-                if game_id not in self.notified_games:
-                    # 如果不是首次加载，且窗口处于最小化或隐藏状态，则发送通知
-                    if not self.first_load and (self.isMinimized() or not self.isVisible()):
-                        away_team = game['away_team']
-                        home_team = game['home_team']
-                        
-                        away_name = NBA_TEAMS_CN.get(away_team['team_tricode'], away_team['team_tricode'])
-                        home_name = NBA_TEAMS_CN.get(home_team['team_tricode'], home_team['team_tricode'])
-                        
-                        away_score = away_team['score']
-                        home_score = home_team['score']
-                        
-                        msg = f"比赛结束：{away_name} {away_score} vs {home_name} {home_score}"
-                        
-                        self.tray_icon.showMessage(
-                            "NBA实时比分",
-                            msg,
-                            QSystemTrayIcon.Information,
-                            3000
-                        )
-                    
-                    # 记录已处理的比赛，避免重复通知
-                    self.notified_games.add(game_id)
-    
-    def update_ui(self):
-        for i in reversed(range(self.games_layout.count())):
-            widget = self.games_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        if not self.games:
-            no_games_label = QLabel("今日暂无比赛")
-            no_games_label.setFont(QFont("Segoe UI", 15))
-            no_games_label.setAlignment(Qt.AlignCenter)
-            no_games_label.setStyleSheet("color: #8e8e93; padding: 50px;")
-            self.games_layout.insertWidget(0, no_games_label)
-        else:
-            live_games = [g for g in self.games if g['is_live']]
-            finished_games = [g for g in self.games if g['is_finished']]
-            other_games = [g for g in self.games if not g['is_live'] and not g['is_finished']]
-            
-            for game in live_games + other_games + finished_games:
-                game_widget = GameWidget(game)
-                self.games_layout.insertWidget(self.games_layout.count() - 1, game_widget)
+    def render_suspended(self):
+        return not self.isVisible() or self.isMinimized() or self.is_hidden
+    
+    def flush_pending_render(self):
+        # 恢复显示时把暂停期间累积的变更一次性渲染
+        if not self.render_pending:
+            return
+        diff, self.pending_diff = self.pending_diff, None
+        self.render_pending = False
+        if diff is None:
+            self.update_stats()
+            return
+        with self.metrics.stage('update_ui'):
+            self.update_ui(diff)
+    
+    def notify_events(self, diff):
+        # 首次加载只记录状态，不弹出历史事件。此时要用完整赛程初始化：从缓存启动时，
+        # 首次刷新的变更集不含未变化的比赛 (304 时为空)，这些比赛之后开赛会因缺少前一状态而漏报
+        if self.first_load:
+            self.event_engine.process(diff_games([], self.games), emit=False)
+            return
+        
+        # 之后事件引擎只处理本次有变化的比赛
+        events = self.event_engine.process(diff)
+        
+        # 仅在窗口最小化、隐藏到托盘或贴边隐藏时发送通知
+        if not events or not self.render_suspended():
+            return
+        
+        for event in events:
+            self.tray_icon.showMessage(
+                "NBA实时比分",
+                format_event_message(event),
+                QSystemTrayIcon.Information,
+                3000
+            )
+    
+    def update_ui(self, diff=None):
+        # 列表模型只对有变化的行发出 dataChanged，视图只重绘其中可见的行；diff 为 None 时全部视为有变化
+        changed = None if diff is None else diff.changed_ids()
         
-        total_games = self.api.get_total_games()
-        live_count = self.api.get_live_games_count()
-        finished_count = self.api.get_finished_games_count()
+        # 按联赛分组 (顺序与数据源一致)，组内按 进行中 / 未开始 / 已结束 排列
+        leagues = {}
+        for game in self.games:
+            leagues.setdefault(game.league_id, []).append(game)
+        grouped = len(leagues) > 1
+        
+        items = []
+        for league_id, games in leagues.items():
+            if grouped:
+                items.append(LeagueHeader(league_id, len(games)))
+            items += [g for g in games if g.is_live]
+            items += [g for g in games if not g.is_live and not g.is_finished]
+            items += [g for g in games if g.is_finished]
+        
+        # 标题行与卡片高度不同，分组时关闭统一行高
+        if self.game_list.uniformItemSizes() == grouped:
+            self.game_list.setUniformItemSizes(not grouped)
+        rows = self.game_model.set_games(items, changed)
+        self.metrics.count('rows_updated', rows)
+        self.no_games_label.setVisible(not self.games)
+        
+        self.update_stats()
+    
+    def update_stats(self):
+        total_games = len(self.games)
+        live_count = sum(1 for game in self.games if game.is_live)
+        finished_count = sum(1 for game in self.games if game.is_finished)
         
-        self.stats_label.setText(f"今日 {total_games} 场比赛 · 进行中 {live_count} · 已结束 {finished_count}")
+        if self.api is not None:
+            is_stale, last_updated, last_error = self.api.is_stale, self.api.last_updated, self.api.last_error
+        else:
+            # 网络模块尚未加载，界面上只有磁盘缓存
+            is_stale, last_updated, last_error = True, self.snapshot[3] if self.snapshot else None, None
+        # 多联赛时个别联赛失败不算整体离线，只在统计栏提示
+        league_errors = getattr(self.api, 'league_errors', None)
+        
+        stats_text = f"今日 {total_games} 场比赛 · 进行中 {live_count} · 已结束 {finished_count}"
+        if is_stale and last_updated:
+            if last_error:
+                stats_text += f" · 离线，数据更新于 {last_updated:%H:%M}"
+            elif not league_errors:
+                stats_text += f" · 缓存于 {last_updated:%H:%M}"
+        if league_errors:
+            stats_text += " · 部分联赛离线"
+        self.stats_label.setToolTip(last_error or league_errors or "")
+        self.stats_label.setText(stats_text)
+        self.update_tray_badge(live_count)
+    
+    def update_tray_badge(self, live_count):
+        # 托盘图标角标显示进行中场数；场数不变时不重设图标，变化时从图标缓存取图
+        if self.tray_icon is None or live_count == self.tray_badge_count:
+            return
+        self.tray_badge_count = live_count
+        self.tray_icon.setIcon(self.icons.icon(badge_text(live_count)))
+        self.tray_icon.setToolTip(f"NBA实时比分 · 进行中 {live_count} 场" if live_count else "NBA实时比分")
     
     def manual_refresh(self):
-        # 1. 隐藏现有卡片
-        self.scroll_area.setVisible(False)
+        # 刷新进行中（按钮已禁用）时忽略托盘菜单的重复触发
+        if not self.refresh_button.isEnabled():
+            return
+        
+        # 1. 隐藏现有卡片 (以及无比赛提示)
+        self.game_list.setVisible(False)
+        self.no_games_label.setVisible(False)
         
         # 2. 显示加载动画
         self.loading_label = QLabel()
@@ -698,15 +930,19 @@ class NBAScoresPanel(QMainWindow):
         # 3. 禁用刷新按钮防止重复点击
         self.refresh_button.setEnabled(False)
         
-        # 4. 延迟执行刷新，模拟网络请求并展示动画
-        QTimer.singleShot(800, self.perform_refresh)
-
-    def perform_refresh(self):
+        # 4. 发起后台刷新；若自动刷新正在进行，则直接等待该请求的结果
+        #    (首屏之后的初始化尚未执行时先完成它，首次刷新随之发起)
+        self.finish_startup()
+        self.fetcher.finished.connect(self.perform_refresh)
         self.load_games()
+
+    def perform_refresh(self, success=True, result=None):
+        self.fetcher.finished.disconnect(self.perform_refresh)
         
         # 移除加载动画
         self.loading_label.deleteLater()
-        self.scroll_area.setVisible(True)
+        self.game_list.setVisible(True)
+        self.no_games_label.setVisible(not self.games)
         
         # 恢复按钮
         self.refresh_button.setEnabled(True)
@@ -719,6 +955,8 @@ class NBAScoresPanel(QMainWindow):
     
     def minimize_to_tray(self):
         self.hide()
+        if not self.tray_icon:
+            return
         self.tray_icon.showMessage(
             "别忘了关注比赛~",
             "程序已最小化到托盘，点击图标恢复显示",
@@ -728,74 +966,40 @@ class NBAScoresPanel(QMainWindow):
 
     def hide_panel(self):
         if not self.is_hidden:
-            screen = QDesktopWidget().screenGeometry()
             panel_rect = self.geometry()
+            edge = self.dock.edge_at(panel_rect)
+            if edge is None:
+                return
+            self.hidden_edge = edge
             
             self.hide_animation = QPropertyAnimation(self, b"geometry")
             self.hide_animation.setDuration(300)
             self.hide_animation.setEasingCurve(QEasingCurve.OutCubic)
-            
-            if panel_rect.right() >= screen.width() - self.edge_threshold:
-                self.hidden_edge = 'right'
-                target_x = screen.width() - 15
-                target_y = panel_rect.y()
-            elif panel_rect.left() <= self.edge_threshold:
-                self.hidden_edge = 'left'
-                target_x = -self.width() + 15
-                target_y = panel_rect.y()
-            elif panel_rect.top() <= self.edge_threshold:
-                self.hidden_edge = 'top'
-                target_x = panel_rect.x()
-                target_y = -self.height() + 15
-            elif panel_rect.bottom() >= screen.height() - self.edge_threshold:
-                self.hidden_edge = 'bottom'
-                target_x = panel_rect.x()
-                target_y = screen.height() - 15
-            else:
-                return
-            
             self.hide_animation.setStartValue(panel_rect)
-            self.hide_animation.setEndValue(QRect(target_x, target_y, self.width(), self.height()))
+            self.hide_animation.setEndValue(self.dock.hide_target(panel_rect, edge))
             self.hide_animation.start()
             self.is_hidden = True
     
     def show_panel(self):
         if self.is_hidden and self.hidden_edge:
-            screen = QDesktopWidget().screenGeometry()
             panel_rect = self.geometry()
             
             self.show_animation = QPropertyAnimation(self, b"geometry")
             self.show_animation.setDuration(400)
             self.show_animation.setEasingCurve(QEasingCurve.OutElastic)
-            
-            if self.hidden_edge == 'right':
-                target_x = screen.width() - self.width() - 40
-                target_y = panel_rect.y()
-            elif self.hidden_edge == 'left':
-                target_x = 40
-                target_y = panel_rect.y()
-            elif self.hidden_edge == 'top':
-                target_x = panel_rect.x()
-                target_y = 40
-            elif self.hidden_edge == 'bottom':
-                target_x = panel_rect.x()
-                target_y = screen.height() - self.height() - 40
-            else:
-                return
-            
             self.show_animation.setStartValue(panel_rect)
-            self.show_animation.setEndValue(QRect(target_x, target_y, self.width(), self.height()))
+            self.show_animation.setEndValue(self.dock.show_target(panel_rect, self.hidden_edge))
             self.show_animation.start()
             self.is_hidden = False
             self.hidden_edge = None
+            # 滑出前先应用贴边隐藏期间累积的更新
+            self.flush_pending_render()
     
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-            self.screen_geometry = QDesktopWidget().screenGeometry() # 缓存屏幕信息
             
-            # 拖拽开始时暂时移除阴影特效以提升性能
-            self.container.setGraphicsEffect(None)
+            # 阴影为缓存的位图，拖拽时无需移除
             # 拖拽时停止任何隐藏计时器
             self.hide_timer.stop()
             
@@ -810,36 +1014,37 @@ class NBAScoresPanel(QMainWindow):
     def mouseReleaseEvent(self, event):
         self.drag_position = None
         
-        # 拖拽结束，恢复阴影特效
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(40)
-        shadow.setColor(QColor(0, 0, 0, 180))
-        shadow.setOffset(0, 10)
-        self.container.setGraphicsEffect(shadow)
-        
         # 拖拽结束后，检查是否停靠在边缘
         if not self.is_hidden:
-            screen_width = self.screen_geometry.width()
-            screen_height = self.screen_geometry.height()
-            panel_rect = self.geometry()
-            
-            if (panel_rect.right() >= screen_width - self.edge_threshold or
-                panel_rect.left() <= self.edge_threshold or
-                panel_rect.top() <= self.edge_threshold or
-                panel_rect.bottom() >= screen_height - self.edge_threshold):
+            # 只读缓存的屏幕几何信息，不在释放鼠标时查询系统
+            if self.dock.edge_at(self.geometry()):
                 # 如果在边缘释放鼠标，启动隐藏计时器
                 self.hide_timer.start(1200)
         
         if self.is_hidden:
             self.show_timer.start(100)
     
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 从托盘或最小化恢复 (包括不经过 restore_window 的路径)
+        if not self.is_hidden:
+            self.flush_pending_render()
+    
     def enterEvent(self, event):
         if self.is_hidden:
             self.show_panel()
         event.accept()
     
     def closeEvent(self, event):
-        self.tray_icon.hide()
+        # 同 quit_app：启动完成前关闭窗口时不访问尚未创建的对象
+        if self.tray_icon:
+            self.tray_icon.hide()
+        if self.fetcher:
+            self.fetcher.shutdown()
+        if self.api:
+            self.api.close()
+        if self.history:
+            self.history.close()
         event.accept()
 
 def main():
@@ -855,43 +1060,7 @@ def main():
     app.setApplicationName("NBAScores.1.0")
     app.setApplicationDisplayName("NBAScores.1.0") # 显式设置显示名称
     
-    # 动态创建并设置应用图标，确保通知栏有图标显示
-    pixmap = QPixmap(64, 64)
-    pixmap.fill(Qt.transparent)
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.Antialiasing)
-    
-    # 1. 绘制背景圆 (使用路径数据中的灰色 #696065)
-    painter.setBrush(QBrush(QColor("#696065")))
-    painter.setPen(Qt.NoPen)
-    painter.drawEllipse(0, 0, 64, 64)
-    
-    # 2. 绘制奖杯图案 (黄色 #FBB01F)
-    painter.setBrush(QBrush(QColor("#FBB01F")))
-    
-    # 奖杯底座
-    painter.drawRect(20, 48, 24, 6)
-    painter.drawRect(26, 42, 12, 6)
-    
-    # 奖杯杯身 (倒梯形 + 半圆)
-    path_cup = QPainterPath()
-    path_cup.moveTo(16, 16)
-    path_cup.lineTo(48, 16)
-    path_cup.lineTo(40, 36)
-    path_cup.lineTo(24, 36)
-    path_cup.closeSubpath()
-    painter.drawPath(path_cup)
-    
-    # 奖杯把手 (左右圆弧)
-    painter.setBrush(Qt.NoBrush)
-    painter.setPen(QPen(QColor("#FBB01F"), 3))
-    painter.drawArc(12, 18, 10, 10, 90*16, 180*16)
-    painter.drawArc(42, 18, 10, 10, -90*16, 180*16)
-    
-    painter.end()
-    app_icon = QIcon(pixmap)
-    app.setWindowIcon(app_icon)
-    
+    # 应用图标 (通知栏图标) 在首屏绘制后由面板创建，见 NBAScoresPanel.finish_startup
     app.setQuitOnLastWindowClosed(False)
     
     panel = NBAScoresPanel()
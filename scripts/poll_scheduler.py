@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+# 自适应轮询调度：根据比赛状态与开赛时间决定下一次刷新间隔。
+# 有比赛进行时快速轮询，全部结束或距开赛尚早时退避到分钟级。
+
+
+class PollScheduler:
+    CRUNCH_INTERVAL = 5         # 第四节 / 加时
+    LIVE_INTERVAL = 10          # 比赛进行中
+    PREGAME_INTERVAL = 30       # 临近开赛 (或已过开赛时间但尚未开始)
+    IDLE_INTERVAL = 15 * 60     # 全部结束 / 今日无比赛
+    MAX_SLEEP = 60 * 60         # 等待开赛时的最长休眠，期间仍需感知赛程变动
+    PREGAME_WINDOW = 15 * 60    # 开赛前多久进入临场轮询
+    ERROR_INTERVAL = 30         # 请求失败后的重试间隔
+
+    def __init__(self):
+        self._tipoff_cache = {} # gameTimeUTC 字符串 -> datetime，避免每次重复解析
+
+    def _tipoff(self, game_time):
+        if not game_time:
+            return None
+        tipoff = self._tipoff_cache.get(game_time)
+        if tipoff is None:
+            # dateutil 只在首次解析时导入，不拖慢启动
+            from dateutil import parser as date_parser
+            try:
+                tipoff = date_parser.isoparse(game_time)
+            except (ValueError, OverflowError):
+                return None
+            if tipoff.tzinfo is None:
+                tipoff = tipoff.replace(tzinfo=timezone.utc)
+            if len(self._tipoff_cache) > 256:
+                # 长时间运行时跨越多日，定期清空避免无限增长
+                self._tipoff_cache.clear()
+            self._tipoff_cache[game_time] = tipoff
+        return tipoff
+
+    @staticmethod
+    def is_crunch_time(game):
+        text = game.game_status_text.upper()
+        return text.startswith('Q4') or text.startswith('OT') or ' OT' in text
+
+    def next_interval(self, games, now=None):
+        # 返回距离下一次刷新的秒数
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        live_games = [game for game in games if game.is_live]
+        if live_games:
+            if any(self.is_crunch_time(game) for game in live_games):
+                return self.CRUNCH_INTERVAL
+            return self.LIVE_INTERVAL
+
+        next_tipoff = None
+        for game in games:
+            if game.is_finished:
+                continue
+            tipoff = self._tipoff(game.game_time)
+            if tipoff is None:
+                # 开赛时间未知，保守地按临场频率轮询
+                return self.PREGAME_INTERVAL
+            if next_tipoff is None or tipoff < next_tipoff:
+                next_tipoff = tipoff
+
+        if next_tipoff is None:
+            return self.IDLE_INTERVAL
+
+        seconds_to_tipoff = (next_tipoff - now).total_seconds()
+        if seconds_to_tipoff <= self.PREGAME_WINDOW:
+            return self.PREGAME_INTERVAL
+
+        # 睡到临场窗口开始，但不超过 MAX_SLEEP
+        return int(min(seconds_to_tipoff - self.PREGAME_WINDOW, self.MAX_SLEEP))
+
+    def next_interval_ms(self, games, now=None):
+        return self.next_interval(games, now) * 1000
@@ -0,0 +1,109 @@
+import random
+import time
+
+import requests
+
+# 网络容错：有限次重试 + 指数退避 (带抖动) + 熔断器。
+# CDN 抖动时避免密集重试，连续失败后暂停请求一段时间。
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.RequestException):
+    def __init__(self, retry_after):
+        super().__init__(f"连续请求失败，暂停 {int(retry_after)} 秒后重试")
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt):
+        # Full Jitter：在 [0, base * 2^attempt] 内随机，避免多个客户端同时重试
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def is_retryable(error):
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRY_STATUS_CODES
+        return False
+
+    def retry_after(self, error):
+        # 服务端给出的 Retry-After (秒)，不超过 max_delay
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if value and value.isdigit():
+            return min(float(value), self.max_delay)
+        return None
+
+    def call(self, func, sleep=time.sleep):
+        # 执行 func()，可重试的错误按退避策略重试，最终失败时抛出最后一次的异常
+        for attempt in range(self.max_attempts):
+            try:
+                return func()
+            except requests.RequestException as e:
+                if attempt == self.max_attempts - 1 or not self.is_retryable(e):
+                    raise
+                delay = self.retry_after(e)
+                sleep(delay if delay is not None else self.backoff(attempt))
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, cooldown=60.0, max_cooldown=600.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = None
+
+    def allow_request(self):
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at >= self.cooldown:
+                # 冷却结束，放行一个探测请求
+                self.state = self.HALF_OPEN
+                return True
+            return False
+        return True
+
+    def retry_after(self):
+        # 熔断打开时距离允许下一次请求的秒数，否则为 0
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.cooldown - (self.clock() - self.opened_at))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            # 探测失败，冷却时间翻倍
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+        elif self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+
+    def is_open(self):
+        return self.state == self.OPEN
@@ -0,0 +1,255 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from snapshot_cache import default_cache_dir
+
+# 比分时间序列：每场比赛只在比分 / 状态 / 节次 / 比赛时钟变化时追加一行 (只追加不修改)，
+# 写入先在内存中攒批，达到条数或间隔后在一个事务内写入 SQLite，刷新线程与界面线程都不会频繁落盘。
+# 支持按比赛与时间范围查询 (比分走势图、赛后回放)，并定期维护磁盘占用：
+#   - 保留期 (默认 30 天) 之前的比赛整体删除；
+#   - 已结束超过 1 天的比赛压缩为只含比分 / 状态 / 节次变化的行 (去掉纯时钟走动)；
+#   - 删除后以增量 VACUUM 归还空闲页。
+# 由 NBAApi / LeagueGroup 在成功拉取新数据后调用 record()，数据来自变更集，只处理有变化的比赛。
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    game_code TEXT,
+    away_tricode TEXT,
+    home_tricode TEXT,
+    game_time TEXT,
+    first_ts INTEGER,
+    last_ts INTEGER,
+    final INTEGER NOT NULL DEFAULT 0,
+    compacted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS score_events (
+    game_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    period INTEGER NOT NULL,
+    clock REAL,
+    away_score INTEGER NOT NULL,
+    home_score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS score_events_game_ts ON score_events (game_id, ts);
+"""
+
+
+def _state(game):
+    # 记录的字段：状态、节次、剩余时间 (秒)、客队比分、主队比分
+    clock = game.clock_seconds
+    return (int(game.game_status), game.period, round(clock, 1) if clock is not None else None,
+            game.away_team.score, game.home_team.score)
+
+
+class ScoreHistory:
+    BATCH_SIZE = 200            # 攒够多少行立即写入
+    FLUSH_INTERVAL = 30         # 最长攒批时间 (秒)
+    RETENTION_DAYS = 30
+    COMPACT_AFTER = 24 * 3600   # 比赛结束多久后压缩
+    MAINTENANCE_INTERVAL = 6 * 3600
+
+    def __init__(self, path=None, retention_days=None):
+        self.path = path or os.path.join(default_cache_dir(), 'history.sqlite3')
+        self.retention_days = retention_days or self.RETENTION_DAYS
+        self.lock = threading.Lock()
+        self.pending = []       # 待写入的 (game_id, ts, status, period, clock, away, home)
+        self.pending_games = {} # game_id -> (game_code, away, home, game_time, 本批首个 ts, 最后 ts, final)
+        self.last_state = {}    # game_id -> 最后一次记录的状态，用于判断是否有变化
+        self.primed = False     # 是否已处理过一次完整快照
+        self.last_flush = time.monotonic()
+        self.last_maintenance = 0.0
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # 由后台刷新线程写入、界面线程查询，访问统一经过 self.lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA auto_vacuum = INCREMENTAL') # 须在建表前设置，已有数据库不受影响
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.commit()
+
+    def _seed(self, game_ids):
+        # 首次见到的比赛从数据库读取最后一行，重启后不会重复记录相同状态
+        placeholders = ','.join('?' * len(game_ids))
+        rows = self.conn.execute(
+            f"SELECT game_id, status, period, clock, away_score, home_score FROM score_events "
+            f"WHERE rowid IN (SELECT MAX(rowid) FROM score_events WHERE game_id IN ({placeholders}) GROUP BY game_id)",
+            game_ids).fetchall()
+        for game_id, *state in rows:
+            self.last_state[game_id] = tuple(state)
+
+    def record(self, diff, fetched_at=None):
+        # 记录一次刷新的变更集；返回新增的行数。
+        # 首次调用检查快照中的全部比赛：启动时从磁盘缓存恢复的比赛不在变更集里，但可能尚未记录
+        changed = diff.changed_ids() if self.primed else list(diff.games)
+        self.primed = True
+        if not changed:
+            return 0
+        ts = int((fetched_at or datetime.now()).timestamp())
+
+        with self.lock:
+            if self.conn is None:
+                return 0
+            unseen = [game_id for game_id in changed if game_id not in self.last_state]
+            if unseen:
+                self._seed(unseen)
+
+            added = 0
+            for game_id in changed:
+                game = diff.games[game_id]
+                state = _state(game)
+                if self.last_state.get(game_id) == state:
+                    continue
+                self.last_state[game_id] = state
+                self.pending.append((game_id, ts) + state)
+                previous = self.pending_games.get(game_id)
+                self.pending_games[game_id] = (game.game_code, game.away_team.team_tricode,
+                                               game.home_team.team_tricode, game.game_time,
+                                               previous[4] if previous else ts, ts, int(game.is_finished))
+                added += 1
+
+            for game_id in diff.removed:
+                self.last_state.pop(game_id, None)
+
+            if len(self.pending) >= self.BATCH_SIZE or time.monotonic() - self.last_flush >= self.FLUSH_INTERVAL:
+                self._flush()
+        return added
+
+    def _flush(self):
+        # 写入失败 (如磁盘已满) 时丢弃这一批，不影响比分刷新
+        self.last_flush = time.monotonic()
+        pending, pending_games = self.pending, self.pending_games
+        self.pending = []
+        self.pending_games = {}
+        try:
+            if pending:
+                with self.conn:
+                    self.conn.executemany('INSERT INTO score_events VALUES (?, ?, ?, ?, ?, ?, ?)', pending)
+                    self.conn.executemany(
+                        "INSERT INTO games (game_id, game_code, away_tricode, home_tricode, game_time, "
+                        "first_ts, last_ts, final) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT (game_id) DO UPDATE SET last_ts = excluded.last_ts, final = excluded.final",
+                        [(game_id,) + values for game_id, values in pending_games.items()])
+            if time.monotonic() - self.last_maintenance >= self.MAINTENANCE_INTERVAL:
+                self._maintain()
+        except sqlite3.Error as e:
+            print(f"写入比分历史失败: {e}")
+
+    def flush(self):
+        with self.lock:
+            if self.conn is not None:
+                self._flush()
+
+    def _maintain(self, now=None):
+        # 保留期之外的比赛整体删除；已结束一段时间的比赛只保留比分 / 状态 / 节次变化
+        self.last_maintenance = time.monotonic()
+        now = int(now or time.time())
+        expired = now - self.retention_days * 86400
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM score_events WHERE game_id IN (SELECT game_id FROM games WHERE last_ts < ?)", (expired,))
+            removed = self.conn.execute("DELETE FROM games WHERE last_ts < ?", (expired,)).rowcount
+
+            compact_ids = [row[0] for row in self.conn.execute(
+                "SELECT game_id FROM games WHERE final = 1 AND compacted = 0 AND last_ts < ?",
+                (now - self.COMPACT_AFTER,))]
+            compacted = 0
+            for game_id in compact_ids:
+                rows = self.conn.execute(
+                    "SELECT rowid, status, period, away_score, home_score FROM score_events "
+                    "WHERE game_id = ? ORDER BY ts, rowid", (game_id,)).fetchall()
+                redundant = [(rowid,) for (rowid, *state), (_, *previous) in zip(rows[1:], rows)
+                             if state == previous]
+                self.conn.executemany("DELETE FROM score_events WHERE rowid = ?", redundant)
+                self.conn.execute("UPDATE games SET compacted = 1 WHERE game_id = ?", (game_id,))
+                compacted += len(redundant)
+        if removed or compacted:
+            # incremental_vacuum 每执行一步只归还一页，executescript 会一直执行到空闲页全部归还
+            self.conn.executescript('PRAGMA incremental_vacuum;')
+        return removed, compacted
+
+    def maintain(self, now=None):
+        # 返回 (删除的比赛数, 压缩掉的行数)
+        with self.lock:
+            if self.conn is None:
+                return 0, 0
+            self.last_maintenance = time.monotonic() # 下面只写入待写数据，维护在之后执行
+            self._flush()
+            return self._maintain(now)
+
+    def query(self, game_id, start=None, end=None):
+        # 按时间顺序返回某场比赛在 [start, end] 内记录的变化，start / end 为 datetime (可省略)
+        sql = ("SELECT ts, status, period, clock, away_score, home_score FROM score_events "
+               "WHERE game_id = ?")
+        params = [game_id]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(int(start.timestamp()))
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(int(end.timestamp()))
+        sql += " ORDER BY ts, rowid"
+
+        with self.lock:
+            if self.conn is None:
+                return []
+            self._flush()
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{
+            'ts': datetime.fromtimestamp(ts),
+            'game_status': status,
+            'period': period,
+            'clock_seconds': clock,
+            'away_score': away_score,
+            'home_score': home_score
+        } for ts, status, period, clock, away_score, home_score in rows]
+
+    def games_between(self, start=None, end=None):
+        # 返回在 [start, end] 内有记录的比赛 (按首次记录时间排序)
+        sql = ("SELECT game_id, game_code, away_tricode, home_tricode, game_time, first_ts, last_ts, final "
+               "FROM games WHERE 1 = 1")
+        params = []
+        if start is not None:
+            sql += " AND last_ts >= ?"
+            params.append(int(start.timestamp()))
+        if end is not None:
+            sql += " AND first_ts <= ?"
+            params.append(int(end.timestamp()))
+        sql += " ORDER BY first_ts, game_id"
+
+        with self.lock:
+            if self.conn is None:
+                return []
+            self._flush()
+            rows = self.conn.execute(sql, params).fetchall()
+        return [{
+            'game_id': game_id,
+            'game_code': game_code,
+            'away_tricode': away,
+            'home_tricode': home,
+            'game_time': game_time,
+            'first_ts': datetime.fromtimestamp(first_ts),
+            'last_ts': datetime.fromtimestamp(last_ts),
+            'final': bool(final)
+        } for game_id, game_code, away, home, game_time, first_ts, last_ts, final in rows]
+
+    def close(self):
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                self._flush()
+            finally:
+                self.conn.close()
+                self.conn = None
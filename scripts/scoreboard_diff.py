@@ -0,0 +1,79 @@
+# 记分板增量比较：以 game_id 为键比较前后两次快照，生成变更集，
+# 让界面、完赛通知等下游只处理真正发生变化的比赛。
+
+
+class ScoreboardDiff:
+    def __init__(self):
+        self.added = []          # 新出现的比赛 game_id
+        self.removed = []        # 消失的比赛 game_id
+        self.score_changed = []  # 比分变化
+        self.status_changed = [] # 比赛状态 (未开始/进行中/已结束) 变化
+        self.updated = []        # 任意字段变化 (包含比分、状态、状态文字等)
+        self.reordered = False   # 比赛顺序是否变化
+        self.games = {}          # 新快照: game_id -> game
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.updated or self.reordered)
+
+    def changed_ids(self):
+        # 新增 + 有更新的比赛，下游只需重新处理这些
+        return self.added + self.updated
+
+    def merge(self, later):
+        # 合并相邻的两个变更集 (self 在前)，得到从 self 的旧快照到 later 新快照的变更集，
+        # 用于界面暂停渲染期间累积多次刷新
+        added = set(self.added)
+        base_ids = [game_id for game_id in self.games if game_id not in added] + self.removed
+        updated = set(self.updated) | set(later.updated)
+
+        merged = ScoreboardDiff()
+        merged.games = later.games
+        base = set(base_ids)
+        for game_id in later.games:
+            if game_id not in base:
+                merged.added.append(game_id)
+            elif game_id in updated or game_id in self.added or game_id in later.added:
+                merged.updated.append(game_id)
+        merged.removed = [game_id for game_id in base_ids if game_id not in later.games]
+        merged.score_changed = [game_id for game_id in merged.updated
+                                if game_id in self.score_changed or game_id in later.score_changed]
+        merged.status_changed = [game_id for game_id in merged.updated
+                                 if game_id in self.status_changed or game_id in later.status_changed]
+        merged.reordered = self.reordered or later.reordered
+        return merged
+
+    def __repr__(self):
+        return (f"ScoreboardDiff(added={self.added}, removed={self.removed}, "
+                f"score_changed={self.score_changed}, status_changed={self.status_changed}, "
+                f"updated={self.updated}, reordered={self.reordered})")
+
+
+def diff_games(old_games, new_games):
+    diff = ScoreboardDiff()
+    old_index = {game.game_id: game for game in old_games}
+    diff.games = {game.game_id: game for game in new_games}
+
+    for game_id, game in diff.games.items():
+        old = old_index.get(game_id)
+        if old is None:
+            diff.added.append(game_id)
+            continue
+
+        # Game 带预计算哈希，哈希不同即可判定有变化，无需深层比较
+        if old == game:
+            continue
+
+        diff.updated.append(game_id)
+        if old.score != game.score:
+            diff.score_changed.append(game_id)
+        if old.game_status != game.game_status:
+            diff.status_changed.append(game_id)
+
+    diff.removed = [game_id for game_id in old_index if game_id not in diff.games]
+
+    # 只比较双方共有比赛的相对顺序，增删不算重排
+    old_order = [game_id for game_id in old_index if game_id in diff.games]
+    new_order = [game_id for game_id in diff.games if game_id in old_index]
+    diff.reordered = old_order != new_order
+
+    return diff
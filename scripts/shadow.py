@@ -0,0 +1,98 @@
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene
+
+# 预渲染阴影：把圆角矩形的模糊阴影只渲染一次为九宫格素材 (按 DPI 缩放缓存)，
+# 再按窗口尺寸拼出整张阴影 (尺寸或 DPI 变化时才重新拼接)，绘制在半透明容器之下。
+# 代替 QGraphicsDropShadowEffect：拖拽时不用移除特效，也不用在松开鼠标时重新模糊。
+
+
+def blur_image(image, radius):
+    # Qt 未公开图像模糊接口，借助 QGraphicsBlurEffect 在离屏场景中渲染一次
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(image))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(radius)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+
+    result = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    scene.render(painter, QRectF(result.rect()), QRectF(image.rect()))
+    painter.end()
+    return result
+
+
+class ShadowPainter:
+    def __init__(self, blur_radius=40, color=QColor(0, 0, 0, 180), offset=QPointF(0, 10), corner_radius=16):
+        self.blur_radius = blur_radius
+        self.color = color
+        self.offset = offset
+        self.corner_radius = corner_radius
+        self._slices = {}  # 设备像素比 -> 九宫格素材
+        self._frame = None # (宽, 高, 设备像素比, 拼好的整张阴影)
+
+    @property
+    def border(self):
+        # 九宫格四角的边长 (逻辑像素)：形状外侧的模糊范围 + 形状内侧的渐变范围 + 圆角，
+        # 保证中间的拉伸区域已达到完整的阴影浓度
+        return self.blur_radius * 2 + self.corner_radius
+
+    def _source(self, scale):
+        source = self._slices.get(scale)
+        if source is None:
+            border = round(self.border * scale)
+            side = border * 2 + 1 # 中间留 1 像素用于拉伸
+            image = QImage(side, side, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.transparent)
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self.color)
+            blur = round(self.blur_radius * scale)
+            radius = self.corner_radius * scale
+            painter.drawRoundedRect(QRectF(blur, blur, side - blur * 2, side - blur * 2), radius, radius)
+            painter.end()
+            # QGraphicsBlurEffect (QualityHint) 的扩散范围约为阴影特效同半径的两倍，取一半与原阴影效果一致
+            source = QPixmap.fromImage(blur_image(image, blur / 2))
+            self._slices[scale] = source
+        return source
+
+    def frame(self, width, height, scale):
+        # 阴影覆盖的区域 = 容器尺寸向外扩展 blur_radius
+        if self._frame is not None and self._frame[:3] == (width, height, scale):
+            return self._frame[3]
+
+        source = self._source(scale)
+        border = round(self.border * scale)
+        extent = round(self.blur_radius * scale)
+        target_width = round(width * scale) + extent * 2
+        target_height = round(height * scale) + extent * 2
+
+        pixmap = QPixmap(target_width, target_height)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        columns = ((0, border, 0, border),
+                   (border, 1, border, target_width - border * 2),
+                   (border + 1, border, target_width - border, border))
+        rows = ((0, border, 0, border),
+                (border, 1, border, target_height - border * 2),
+                (border + 1, border, target_height - border, border))
+        for source_x, source_w, target_x, target_w in columns:
+            for source_y, source_h, target_y, target_h in rows:
+                if target_w > 0 and target_h > 0:
+                    painter.drawPixmap(QRectF(target_x, target_y, target_w, target_h), source,
+                                       QRectF(source_x, source_y, source_w, source_h))
+        painter.end()
+        pixmap.setDevicePixelRatio(scale)
+
+        self._frame = (width, height, scale, pixmap)
+        return pixmap
+
+    def paint(self, painter, rect, scale=1.0):
+        # rect 为容器在窗口中的位置 (逻辑像素)
+        pixmap = self.frame(rect.width(), rect.height(), scale)
+        painter.drawPixmap(QPointF(rect.x() - self.blur_radius + self.offset.x(),
+                                   rect.y() - self.blur_radius + self.offset.y()), pixmap)
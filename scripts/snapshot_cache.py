@@ -0,0 +1,105 @@
+import json
+import os
+from datetime import date, datetime, timedelta
+
+from game_model import Game
+
+# 记分板快照的磁盘缓存：保存最近一次成功解析的比赛数据与校验值，
+# 启动时先渲染缓存内容，使首屏不依赖网络。
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'NBAScores')
+
+
+def atomic_write_json(path, data):
+    # 先写临时文件再替换，避免进程中途退出留下损坏的缓存
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+class SnapshotCache:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), 'scoreboard.json')
+
+    def save(self, games, etag=None, last_modified=None, fetched_at=None):
+        data = {
+            'version': CACHE_VERSION,
+            'fetched_at': (fetched_at or datetime.now()).isoformat(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'games': [game.to_dict() for game in games]
+        }
+        try:
+            atomic_write_json(self.path, data)
+            return True
+        except OSError as e:
+            print(f"写入缓存失败: {e}")
+            return False
+
+    def load(self):
+        # 返回 (games, etag, last_modified, fetched_at)，缓存不存在或损坏时返回 None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if data.get('version') != CACHE_VERSION:
+            return None
+
+        try:
+            games = [Game.from_dict(item) for item in data.get('games', [])]
+            fetched_at = datetime.fromisoformat(data['fetched_at'])
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"读取缓存失败: {e}")
+            return None
+
+        return games, data.get('etag'), data.get('last_modified'), fetched_at
+
+
+class DayCache:
+    # 历史比赛日缓存：只保存已经不会再变化的日期 (全部完赛或过去的无比赛日)，永久有效
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(default_cache_dir(), 'days')
+
+    def _path(self, day):
+        return os.path.join(self.directory, f"{day.isoformat()}.json")
+
+    @staticmethod
+    def is_final(day, games, today=None):
+        # 比赛日期按美东时间计算，本地“昨天”可能仍是美东的今天，因此留出一天余量
+        today = today or date.today()
+        if day >= today - timedelta(days=1):
+            return False
+        return all(game.is_finished for game in games)
+
+    def save(self, day, games):
+        try:
+            atomic_write_json(self._path(day), {
+                'version': CACHE_VERSION,
+                'games': [game.to_dict() for game in games]
+            })
+            return True
+        except OSError as e:
+            print(f"写入缓存失败: {e}")
+            return False
+
+    def load(self, day):
+        try:
+            with open(self._path(day), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != CACHE_VERSION:
+            return None
+        try:
+            return [Game.from_dict(item) for item in data.get('games', [])]
+        except (TypeError, ValueError):
+            return None
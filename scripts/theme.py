@@ -0,0 +1,132 @@
+import json
+import os
+import re
+
+from PyQt5.QtGui import QColor, QFont
+
+from snapshot_cache import default_cache_dir
+
+# 比赛卡片主题：三种状态 (进行中 / 已结束 / 未开始) 的配色与字体只生成一次，
+# 由列表委托直接用于绘制，刷新时不再创建颜色、字体或解析样式表。
+# 用户主题：NBA_SCORES_THEME 指定 JSON 文件路径，或放置在缓存目录下的 theme.json，
+# 只需写出要覆盖的字段，例如 {"live": {"accent": "#22d3ee"}}。
+
+STATES = ('live', 'finished', 'scheduled')
+
+_RGBA = re.compile(r'rgba\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*\)')
+
+DEFAULT_THEME = {
+    # 进行中：深邃黑底 + 霓虹绿光晕
+    'live': {
+        'bg': 'rgba(30, 41, 59, 0.7)',
+        'border': 'rgba(74, 222, 128, 0.3)',
+        'text_primary': '#ffffff',
+        'text_secondary': '#94a3b8',
+        'accent': '#4ade80', # 亮绿
+        'status_bg': 'rgba(74, 222, 128, 0.15)'
+    },
+    # 已结束：低调深灰
+    'finished': {
+        'bg': 'rgba(30, 41, 59, 0.4)',
+        'border': 'rgba(255, 255, 255, 0.05)',
+        'text_primary': '#cbd5e1',
+        'text_secondary': '#64748b',
+        'accent': '#94a3b8',
+        'status_bg': 'rgba(148, 163, 184, 0.1)'
+    },
+    # 未开始：温暖琥珀
+    'scheduled': {
+        'bg': 'rgba(30, 41, 59, 0.7)',
+        'border': 'rgba(251, 191, 36, 0.2)',
+        'text_primary': '#ffffff',
+        'text_secondary': '#94a3b8',
+        'accent': '#fbbf24', # 琥珀色
+        'status_bg': 'rgba(251, 191, 36, 0.15)'
+    },
+    'hover_bg': 'rgba(51, 65, 85, 0.8)',
+    # 字体：[字族, 字号, 是否加粗]
+    'fonts': {
+        'status': ['Microsoft YaHei UI', 9, True],
+        'score': ['Segoe UI', 20, True],
+        'divider': ['Segoe UI', 16, False],
+        'team_name': ['Microsoft YaHei UI', 14, True],
+        'team_code': ['Segoe UI', 8, False]
+    }
+}
+
+
+def parse_color(value):
+    # QColor 不识别 CSS 的 rgba(r, g, b, 0.5) 写法，这里单独解析
+    match = _RGBA.fullmatch(value.strip())
+    if match is None:
+        color = QColor(value)
+        if not color.isValid():
+            raise ValueError(f"无法识别的颜色: {value}")
+        return color
+    red, green, blue, alpha = match.groups()
+    color = QColor(int(red), int(green), int(blue))
+    color.setAlphaF(min(1.0, float(alpha)))
+    return color
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            merged[key] = _merge(base[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class Theme:
+    def __init__(self, overrides=None, name='default'):
+        self.name = name
+        self.values = _merge(DEFAULT_THEME, overrides or {})
+        self._colors = {}
+        self._fonts = {}
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        if not isinstance(overrides, dict):
+            raise ValueError("主题文件必须是 JSON 对象")
+        return cls(overrides, name=os.path.splitext(os.path.basename(path))[0])
+
+    def colors(self, state):
+        # 状态 -> {bg, border, text_primary, text_secondary, accent, status_bg, hover_bg} 的 QColor
+        colors = self._colors.get(state)
+        if colors is None:
+            colors = {name: parse_color(value) for name, value in self.values[state].items()}
+            colors['hover_bg'] = parse_color(self.values['hover_bg'])
+            self._colors[state] = colors
+        return colors
+
+    def font(self, role):
+        # 同一角色的所有标签共用一个 QFont 对象
+        font = self._fonts.get(role)
+        if font is None:
+            family, size, bold = self.values['fonts'][role]
+            font = QFont(family, size, QFont.Bold if bold else QFont.Normal)
+            if role == 'score':
+                font.setLetterSpacing(QFont.AbsoluteSpacing, 1)
+            self._fonts[role] = font
+        return font
+
+
+def load_theme():
+    # NBA_SCORES_THEME > 缓存目录下的 theme.json > 内置主题；主题文件有误时回退到内置主题
+    path = os.environ.get('NBA_SCORES_THEME') or os.path.join(default_cache_dir(), 'theme.json')
+    if not os.path.exists(path):
+        return Theme()
+    try:
+        theme = Theme.from_file(path)
+        for state in STATES:
+            theme.colors(state) # 提前解析，字段缺失或颜色有误时在这里就回退
+        for role in DEFAULT_THEME['fonts']:
+            theme.font(role)
+        return theme
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"加载主题失败: {e}")
+        return Theme()